@@ -0,0 +1,74 @@
+"""
+Writes synthetic Eternal Return result CSVs for benchmarking.
+
+    python benchmarks/generate_results.py OUT_DIR --teams 2000 --rounds 6 --encoding cp949
+"""
+import argparse
+import csv
+import os
+import random
+
+HEADER = ['rank', 'teamNumber', 'teamName', 'tournament placement score',
+          'tournament kill score', 'tournament total score', 'teamKill']
+PLACEMENT_POINTS = [10, 7, 5, 4, 3, 2, 1]
+
+SYLLABLES = "가나다라마바사아자차카타파하강산별빛달해솔바람구름하늘노을새벽"
+PREFIXES = ["Team", "ER", "Gaming", "Esports", "Club"]
+
+
+def team_names(count, rng):
+    """Mix of Korean and Latin names, unique, some with inner spaces."""
+    names = set()
+    while len(names) < count:
+        if rng.random() < 0.6:
+            name = ''.join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 5)))
+            if rng.random() < 0.3:
+                name += f" {rng.randint(1, 99)}"
+        else:
+            name = f"{rng.choice(PREFIXES)} {rng.randint(1, 99999)}"
+        names.add(name)
+    return sorted(names)
+
+
+def write_round(path, names, rng, encoding='utf-8-sig'):
+    numbers = {name: i + 1 for i, name in enumerate(names)}
+    order = names[:]
+    rng.shuffle(order)
+    with open(path, 'w', encoding=encoding, newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(HEADER)
+        for place, name in enumerate(order, 1):
+            kills = min(rng.randint(0, 4) + (rng.random() < 0.2) * rng.randint(0, 8), 15)
+            placement = PLACEMENT_POINTS[place - 1] if place <= len(PLACEMENT_POINTS) else 0
+            writer.writerow([place, numbers[name], name,
+                             placement, kills, placement + kills, kills])
+
+
+def generate(out_dir, teams=20, rounds=6, encoding='utf-8-sig', seed=0):
+    """Creates round_01.csv.. in out_dir and returns their paths in round order."""
+    rng = random.Random(seed)
+    names = team_names(teams, rng)
+    os.makedirs(out_dir, exist_ok=True)
+    paths = []
+    for r in range(rounds):
+        path = os.path.join(out_dir, f"round_{r + 1:02d}.csv")
+        write_round(path, names, rng, encoding)
+        paths.append(path)
+    return paths
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate synthetic ER result CSV files")
+    parser.add_argument('out', help="output folder")
+    parser.add_argument('--teams', type=int, default=20)
+    parser.add_argument('--rounds', type=int, default=6)
+    parser.add_argument('--encoding', choices=['utf-8-sig', 'cp949'], default='utf-8-sig')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    paths = generate(args.out, args.teams, args.rounds, args.encoding, args.seed)
+    print(f"Wrote {len(paths)} files with {args.teams} teams to {os.path.abspath(args.out)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,183 @@
+"""
+Times ingestion, accumulation, ranking, a headless standings-table refresh
+and the Monte Carlo outlook over synthetic tournaments of growing size.
+
+    python benchmarks/run_benchmarks.py                  # run and compare with baseline.json
+    python benchmarks/run_benchmarks.py --save-baseline  # store this run as the baseline
+"""
+import argparse
+import json
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from generate_results import generate
+from ranking import RankingIndex
+from round_reader import read_round
+from score_matrix import ScoreMatrix
+import simulation
+from tournament_calculator import add_round, rank_teams, start_tournament
+from tournament_gui import RankedRows, StandingsTable
+
+BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baseline.json')
+SIZES = [20, 200, 2000, 10000]
+SIMS = 10_000   # simulated endings per simulate benchmark run
+
+
+class MemoryTree:
+    """The part of the ttk.Treeview API StandingsTable uses, kept in a list."""
+
+    def __init__(self):
+        self.children = []
+        self.values = {}
+
+    def insert(self, parent, index, iid, values, tags):
+        self.children.insert(index, iid)
+        self.values[iid] = values
+
+    def move(self, iid, parent, index):
+        self.children.remove(iid)
+        self.children.insert(index, iid)
+
+    def delete(self, iid):
+        self.children.remove(iid)
+        del self.values[iid]
+
+    def item(self, iid, values, tags):
+        self.values[iid] = values
+
+    def yview(self, *args):
+        pass
+
+
+def timed(fn, repeat):
+    """Median wall time of fn() in milliseconds."""
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def bench_size(teams, rounds, workdir, repeat):
+    results = {}
+    paths = {}
+    for encoding in ('utf-8-sig', 'cp949'):
+        paths[encoding] = generate(os.path.join(workdir, f"{teams}_{encoding}"), teams, rounds, encoding, seed=teams)
+        results[f"ingest[{encoding}]"] = timed(lambda: [read_round(p) for p in paths[encoding]], repeat)
+
+    records = [read_round(p) for p in paths['utf-8-sig']]
+    rounds_data = [{t: {'total': s[0], 'kill': s[1]} for t, s in r.scores.items()} for r in records]
+
+    def accumulate():
+        stats = start_tournament(rounds_data[0])
+        for data, record in zip(rounds_data[1:], records[1:]):
+            add_round(stats, data, record.path)
+        return stats
+    results["accumulate"] = timed(accumulate, repeat)
+
+    def fill_matrix():
+        matrix = ScoreMatrix()
+        for record in records:
+            matrix.add_round(record.scores)
+        return matrix
+    results["matrix+rank_history"] = timed(lambda: fill_matrix().rank_history(), repeat)
+
+    stats = accumulate()
+    results["rank_full"] = timed(lambda: rank_teams(stats), repeat)
+
+    ranking = RankingIndex((t, (s['total_score'], s['kill_score'])) for t, s in stats.items())
+    names = list(stats)
+    rng = random.Random(teams)
+
+    def penalty_clicks():
+        for _ in range(100):
+            team = rng.choice(names)
+            ranking.update(team, (stats[team]['total_score'] - rng.choice((1, 3)), stats[team]['kill_score']))
+    results["rerank_x100"] = timed(penalty_clicks, repeat)
+
+    def make_row(rank, team):
+        s = stats[team]
+        return (team, (rank, team, f"{s['total_score']:.1f}", f"{s['kill_score']:.1f}", "0"), ())
+
+    def table_build():
+        table = StandingsTable(MemoryTree())
+        table.update(RankedRows(ranking, make_row))
+        return table
+    results["table_build"] = timed(table_build, repeat)
+
+    table = table_build()
+
+    def table_penalty():
+        team = rng.choice(names)
+        ranking.update(team, (stats[team]['total_score'] - 3, stats[team]['kill_score']))
+        table.update(RankedRows(ranking, make_row))
+    results["table_penalty_refresh"] = timed(table_penalty, max(repeat, 20))
+
+    if simulation.np is not None:
+        matrix = fill_matrix()
+        ranked = [s['team_name'] for _, s in rank_teams(stats)]
+        ids = [matrix.ids[name] for name in ranked]
+
+        def simulate():
+            simulation.simulate([stats[name]['total_score'] for name in ranked], [stats[name]['kill_score'] for name in ranked],
+                                [[column[i] for i in ids] for column in matrix.totals],
+                                [[column[i] for i in ids] for column in matrix.kills], 3, SIMS, seed=teams)
+        results[f"simulate[{SIMS // 1000}k]"] = timed(simulate, 1)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="ER calculator benchmarks")
+    parser.add_argument('--sizes', type=int, nargs='+', default=SIZES, help="team counts to run")
+    parser.add_argument('--rounds', type=int, default=6)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--baseline', default=BASELINE)
+    parser.add_argument('--save-baseline', action='store_true', help="store this run as the new baseline")
+    parser.add_argument('--tolerance', type=float, default=0.25, help="slowdown ratio reported as regression")
+    args = parser.parse_args()
+
+    current = {}
+    with tempfile.TemporaryDirectory() as workdir:
+        for teams in args.sizes:
+            for name, ms in bench_size(teams, args.rounds, workdir, args.repeat).items():
+                current[f"{name}@{teams}"] = ms
+
+    baseline = {}
+    if os.path.exists(args.baseline) and not args.save_baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            baseline = json.load(f)
+
+    regressions = []
+    print(f"{'Benchmark':<40} {'ms':>10} {'baseline':>10} {'change':>8}")
+    print("=" * 71)
+    for name, ms in current.items():
+        base = baseline.get(name)
+        if base:
+            change = ms / base - 1
+            flag = "  <-- slower" if change > args.tolerance else ""
+            if flag:
+                regressions.append(name)
+            print(f"{name:<40} {ms:>10.3f} {base:>10.3f} {change:>+7.0%}{flag}")
+        else:
+            print(f"{name:<40} {ms:>10.3f} {'-':>10} {'':>8}")
+
+    if args.save_baseline:
+        with open(args.baseline, 'w', encoding='utf-8') as f:
+            json.dump(current, f, indent=2)
+        print(f"\nBaseline saved to {args.baseline}")
+    elif regressions:
+        print(f"\n{len(regressions)} regression(s) over {args.tolerance:.0%}: {', '.join(regressions)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,96 @@
+from bisect import bisect_right
+
+# Checkpoint race model
+# The first `slots` teams to reach the checkpoint score pass it. Teams that
+# reach it after the same round are ordered by total, then kills. In each of
+# the remaining rounds a team can gain anywhere from 0 to `max_points`, so the
+# best case for a team is that it scores the maximum while nobody else scores,
+# and the worst case is that every rival scores the maximum.
+
+CLINCHED = 'clinched'
+ELIMINATED = 'eliminated'
+ALIVE = 'alive'
+
+
+def crossing_rounds(cumulative, threshold):
+    """
+    First round (0-based) after which each team's running total reached the
+    threshold, or None. `cumulative` is rounds x teams, e.g. ScoreMatrix.cumulative().
+    """
+    result = [None] * (len(cumulative[0]) if len(cumulative) else 0)
+    for r, row in enumerate(cumulative):
+        for j, total in enumerate(row):
+            if result[j] is None and total >= threshold:
+                result[j] = r
+    return result
+
+
+def analyze(teams, threshold, remaining, max_points, slots=1, unit=1.0):
+    """
+    teams: [{'team', 'total', 'kill', 'crossed'}] where crossed is the round the
+    team reached the threshold (None if it has not); an optional 'crossed_total'
+    (total at that round) orders teams that reached it in the same round.
+    `unit` is the smallest score step, used to turn "more than" into a number.
+
+    Returns { team: {'status', 'need', 'secure'} }:
+      status - CLINCHED (holds a slot whatever happens), ELIMINATED (cannot get a
+               slot in any outcome) or ALIVE
+      need   - points still needed to reach the threshold
+      secure - fewest points that guarantee a slot even if every rival scores the
+               maximum, or None if no amount within the remaining rounds does
+    """
+    result = {}
+    crossed = [t for t in teams if t['total'] >= threshold]
+    crossed.sort(key=lambda t: (t['crossed'] if t['crossed'] is not None else float('inf'),
+                                -t.get('crossed_total', t['total']), -t['kill']))
+    for i, t in enumerate(crossed):
+        status = CLINCHED if i < slots else ELIMINATED
+        result[t['team']] = {'status': status, 'need': 0.0, 'secure': 0.0 if status == CLINCHED else None}
+
+    open_slots = slots - len(crossed)
+    chasing = [t for t in teams if t['total'] < threshold]
+    if not chasing:
+        return result
+
+    deficits = sorted(threshold - t['total'] for t in chasing)
+
+    # Rivals that could first reach the threshold in round k (1-based), best
+    # possible total first. Shared by every team, so built once per round.
+    by_round = [None]
+    for k in range(1, remaining + 1):
+        lo, hi = (k - 1) * max_points, k * max_points
+        best = sorted(((t['total'] + hi, t['team']) for t in chasing
+                       if lo < threshold - t['total'] <= hi), reverse=True)
+        by_round.append(best)
+
+    for t in chasing:
+        need = threshold - t['total']
+        if open_slots <= 0 or max_points <= 0 or need > remaining * max_points:
+            result[t['team']] = {'status': ELIMINATED, 'need': need, 'secure': None}
+            continue
+
+        secure = None
+        first = max(1, -int(-need // max_points))
+        for k in range(first, remaining + 1):
+            # Rivals able to get there a round earlier are ahead regardless
+            earlier = bisect_right(deficits, (k - 1) * max_points)
+            if need <= (k - 1) * max_points:
+                earlier -= 1
+            allowed = open_slots - 1 - earlier
+            if allowed < 0:
+                break  # only gets worse for later rounds
+
+            # Beat every same-round rival except the `allowed` best ones
+            rivals = by_round[k]
+            idx = allowed
+            if (t['total'] + k * max_points, t['team']) in rivals[:allowed + 1]:
+                idx += 1
+            target = threshold
+            if idx < len(rivals):
+                target = max(target, rivals[idx][0] + unit)
+            points = target - t['total']
+            if points <= k * max_points and (secure is None or points < secure):
+                secure = points
+
+        result[t['team']] = {'status': ALIVE, 'need': need, 'secure': secure}
+    return result
@@ -0,0 +1,204 @@
+import csv
+import math
+import os
+from array import array
+
+try:
+    import numpy as np
+except ImportError:  # numpy is optional; plain Python loops are used instead
+    np = None
+
+from round_reader import PLACEMENT_COLUMN, TEAM_COLUMN, RoundFileError, detect_encoding, normalize_name, SNIFF_BYTES
+from stage_timer import TIMER
+
+# Other columns of the ER result export (PLACEMENT_COLUMN comes from round_reader)
+TEAM_KILL_COLUMN = 'teamKill'
+
+NAN = float('nan')
+
+
+class ColumnStore:
+    """
+    Any numeric column of the result exports, kept column by column.
+
+    Team names are interned to integer ids like in ScoreMatrix, and a decoded
+    column is one array('d') per round indexed by team id, NaN where a team has
+    no row (or no number) in that round. Adding a round only decodes the team
+    column and the columns given to the constructor; any other column is read
+    from the files the first time someone asks for it, so memory stays
+    proportional to the columns actually used. Aggregations run over the
+    rounds x teams matrix of a column, with numpy when it is installed.
+    """
+
+    def __init__(self, columns=()):
+        self.teams = []     # id -> name
+        self.ids = {}       # name -> id
+        self.rounds = []    # {'path', 'encoding', 'header', 'stat', 'rename'}
+        self.columns = {}   # column -> [array('d') per round]
+        self.eager = list(columns)
+
+    def __len__(self):
+        return len(self.rounds)
+
+    def intern(self, name):
+        team_id = self.ids.get(name)
+        if team_id is None:
+            team_id = self.ids[name] = len(self.teams)
+            self.teams.append(name)
+            for values in self.columns.values():
+                for column in values:
+                    column.append(NAN)
+        return team_id
+
+    @TIMER.timed('column store')
+    def add_round(self, path, rename=None):
+        """
+        Adds a result file as the next round. `rename` maps team names in the
+        file to the names used for them (e.g. confirmed aliases).
+        """
+        st = os.stat(path)
+        info = {'path': path, 'encoding': None, 'header': None, 'stat': (st.st_size, st.st_mtime), 'rename': dict(rename or {})}
+        # Earlier rounds must hold every column this round gets, so a missing one is decoded for them first
+        self.project(*self.eager)
+        names = list(self.columns)
+        decoded = self._read(info, names)
+        for name in names:
+            self.columns.setdefault(name, [self._empty() for _ in self.rounds]).append(decoded[name])
+        self.rounds.append(info)
+        return len(self.rounds) - 1
+
+    def header(self, index):
+        return list(self.rounds[index]['header'])
+
+    def project(self, *names):
+        """Makes sure the given columns are decoded, reading each file once for all of them."""
+        missing = [name for name in names if name not in self.columns]
+        if not missing:
+            return
+        per_round = [self._read(info, missing) for info in self.rounds]
+        for name in missing:
+            self.columns[name] = [decoded[name] for decoded in per_round]
+
+    # Aggregations, one value per team id
+
+    def matrix(self, name):
+        """rounds x teams values of a column (numpy array or list of lists), NaN where missing."""
+        self.project(name)
+        values = self.columns[name]
+        if np is not None:
+            return np.array(values, dtype=float).reshape(len(values), len(self.teams))
+        return [list(column) for column in values]
+
+    def sum(self, name):
+        return self._reduce(name, lambda m: np.nansum(m, axis=0), math.fsum, 0.0)
+
+    def max(self, name):
+        return self._reduce(name, lambda m: np.fmax.reduce(m, axis=0), max, NAN)
+
+    def min(self, name):
+        return self._reduce(name, lambda m: np.fmin.reduce(m, axis=0), min, NAN)
+
+    def mean(self, name):
+        return self._reduce(name, _nan_mean, lambda vs: math.fsum(vs) / len(vs), NAN)
+
+    def count(self, name, value):
+        """Rounds in which each team's value equals `value`, e.g. count('rank', 1) for first places."""
+        return self._reduce(name, lambda m: (m == value).sum(axis=0).astype(float),
+                            lambda vs: float(sum(1 for v in vs if v == value)), 0.0)
+
+    def _reduce(self, name, vectorized, scalar, empty):
+        if not self.rounds:
+            return [empty] * len(self.teams)
+        m = self.matrix(name)
+        if np is not None:
+            return vectorized(m).tolist()
+        result = []
+        for j in range(len(self.teams)):
+            present = [row[j] for row in m if row[j] == row[j]]
+            result.append(scalar(present) if present else empty)
+        return result
+
+    # Reading
+
+    def _empty(self):
+        return array('d', [NAN]) * len(self.teams)
+
+    def _read(self, info, names):
+        """Decodes the given columns of one round into arrays indexed by team id."""
+        path = info['path']
+        if info['stat'] is not None:
+            try:
+                st = os.stat(path)
+            except OSError as e:
+                raise RoundFileError(f"{os.path.basename(path)} is no longer readable ({e})")
+            if (st.st_size, st.st_mtime) != info['stat']:
+                raise RoundFileError(f"{os.path.basename(path)} changed after it was added")
+
+        encoding = info['encoding']
+        if encoding is None:
+            with open(path, 'rb') as f:
+                encoding = detect_encoding(f.read(SNIFF_BYTES))
+        try:
+            header, teams, cells = self._parse(path, encoding, names)
+        except UnicodeDecodeError:
+            if encoding == 'cp949':
+                raise RoundFileError("unsupported encoding")
+            encoding = 'cp949'
+            try:
+                header, teams, cells = self._parse(path, encoding, names)
+            except UnicodeDecodeError:
+                raise RoundFileError("unsupported encoding")
+        info['encoding'], info['header'] = encoding, header
+
+        rename = info['rename']
+        ids = [self.intern(rename.get(team, team)) for team in teams]
+        decoded = {}
+        for name in names:
+            column = self._empty()
+            for team_id, value in zip(ids, cells[name]):
+                column[team_id] = value
+            decoded[name] = column
+        return decoded
+
+    @staticmethod
+    def _parse(path, encoding, names):
+        try:
+            return ColumnStore._parse_rows(path, encoding, names)
+        except csv.Error as e:
+            raise RoundFileError(f"malformed CSV ({e})")
+
+    @staticmethod
+    def _parse_rows(path, encoding, names):
+        with open(path, 'r', encoding=encoding, newline='') as f:
+            rows = csv.reader(f)
+            header = [name.strip() for name in next(rows, None) or []]
+            if TEAM_COLUMN not in header:
+                raise RoundFileError(f"'{TEAM_COLUMN}' column not found")
+            team_idx = header.index(TEAM_COLUMN)
+            wanted = [(name, header.index(name) if name in header else None) for name in names]
+            teams = []
+            cells = {name: [] for name in names}
+            for row in rows:
+                if team_idx >= len(row):
+                    continue
+                team = normalize_name(row[team_idx])
+                if not team:
+                    continue
+                teams.append(team)
+                for name, idx in wanted:
+                    value = NAN
+                    if idx is not None and idx < len(row):
+                        try:
+                            value = float(row[idx].strip() or 'nan')
+                        except ValueError:
+                            pass
+                    cells[name].append(value)
+        return header, teams, cells
+
+
+def _nan_mean(m):
+    """Mean over rounds ignoring NaN, without numpy's warning for teams with no values."""
+    present = ~np.isnan(m)
+    counts = present.sum(axis=0)
+    sums = np.where(present, m, 0.0).sum(axis=0)
+    return np.divide(sums, counts, out=np.full(sums.shape, np.nan), where=counts > 0)
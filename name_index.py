@@ -0,0 +1,89 @@
+from collections import Counter
+
+
+class NameIndex:
+    """
+    Trigram index over registered team names, used to suggest which team an
+    unknown name in a round (a typo or a renamed team) most likely is.
+
+    Each name is case-folded, padded ("  name ") and split into trigrams, and
+    every trigram keeps the set of names containing it. A lookup only counts
+    names that share a trigram with the query, skipping trigrams so common they
+    say little (e.g. "tea" when most teams are "Team 1234"), then scores the
+    best few candidates exactly. The cost follows the posting lists touched
+    rather than the number of registered teams.
+    """
+    N = 3
+    COMMON = 0.25       # share of all names above which a trigram is skipped
+    CANDIDATES = 32     # candidates scored exactly per lookup
+
+    def __init__(self, names=()):
+        self.grams = {}      # name -> frozenset of its trigrams
+        self.postings = {}   # trigram -> set of names
+        for name in names:
+            self.add(name)
+
+    def __len__(self):
+        return len(self.grams)
+
+    @classmethod
+    def trigrams(cls, name):
+        padded = '  ' + ' '.join(name.casefold().split()) + ' '
+        return frozenset(padded[i:i + cls.N] for i in range(len(padded) - cls.N + 1))
+
+    def add(self, name):
+        if name in self.grams:
+            return
+        grams = self.grams[name] = self.trigrams(name)
+        for gram in grams:
+            self.postings.setdefault(gram, set()).add(name)
+
+    def discard(self, name):
+        grams = self.grams.pop(name, None)
+        for gram in grams or ():
+            names = self.postings[gram]
+            names.discard(name)
+            if not names:
+                del self.postings[gram]
+
+    def suggest(self, name, limit=3, exclude=(), min_score=0.3):
+        """
+        Up to `limit` registered names most similar to `name` as (name, score),
+        best first. Score is the Dice coefficient of the trigram sets (1.0 for
+        identical). Names in `exclude` are never suggested.
+        """
+        query = self.trigrams(name)
+        lists = sorted((self.postings[g] for g in query if g in self.postings), key=len)
+        if not lists:
+            return []
+        common = max(self.CANDIDATES, len(self.grams) * self.COMMON)
+        rare = [names for names in lists if len(names) <= common] or lists[:1]
+
+        shared = Counter()
+        for names in rare:
+            shared.update(names)
+        best = []
+        for candidate, _ in shared.most_common(self.CANDIDATES + len(exclude)):
+            if candidate in exclude:
+                continue
+            grams = self.grams[candidate]
+            score = 2 * len(query & grams) / (len(query) + len(grams))
+            if score >= min_score:
+                best.append((score, candidate))
+        best.sort(key=lambda item: (-item[0], item[1]))
+        return [(candidate, score) for score, candidate in best[:limit]]
+
+
+def apply_aliases(scores, aliases, known=()):
+    """
+    Renames the teams of one round through confirmed aliases ({alias: team}).
+    A name in `known` is left alone, and so is an alias whose team already
+    appears in the round, so an alias can never merge two real rows.
+    """
+    renamed = {}
+    for name, value in scores.items():
+        team = aliases.get(name)
+        if team is not None and name not in known and team not in scores and team not in renamed:
+            name = team
+        renamed[name] = value
+    return renamed
@@ -0,0 +1,97 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+
+from round_reader import RoundRecord, file_digest, read_round
+from stage_timer import TIMER
+
+
+class ParseCache:
+    """
+    On-disk cache of parsed result files, keyed by the sha1 of their content.
+
+    A file whose path, size and mtime match what was seen before is answered
+    without reading it; otherwise it is hashed and only parsed if that content
+    has never been seen. At most `max_entries` parsed rounds are kept and the
+    least recently used ones are evicted. Any database problem falls back to
+    reading the file directly. Durability is relaxed (synchronous=OFF): losing
+    the last writes in a crash only costs a re-parse.
+    """
+
+    def __init__(self, path, max_entries=1000):
+        self.path = path
+        self.max_entries = max_entries
+        self.lock = threading.Lock()
+        self.db = None
+        try:
+            self.db = sqlite3.connect(path, check_same_thread=False)
+            columns = [row[1] for row in self.db.execute("PRAGMA table_info(rounds)")]
+            if columns and 'placements' not in columns:
+                # Written before placements were kept; re-parsing is all it costs
+                self.db.executescript("DROP TABLE rounds; DROP TABLE IF EXISTS files;")
+            self.db.executescript("""
+                PRAGMA journal_mode = WAL;
+                PRAGMA synchronous = OFF;
+                CREATE TABLE IF NOT EXISTS rounds (
+                    digest TEXT PRIMARY KEY, encoding TEXT, rows INTEGER,
+                    scores TEXT, placements TEXT, last_used REAL);
+                CREATE TABLE IF NOT EXISTS files (
+                    path TEXT PRIMARY KEY, size INTEGER, mtime REAL, digest TEXT);
+                CREATE INDEX IF NOT EXISTS rounds_lru ON rounds (last_used);
+            """)
+        except sqlite3.Error:
+            self.db = None
+
+    @TIMER.timed('cached read')
+    def read_round(self, path):
+        """Same result as round_reader.read_round, served from the cache when possible."""
+        if self.db is None:
+            return read_round(path)
+        path = os.path.abspath(path)
+        st = os.stat(path)
+        stat = (st.st_size, st.st_mtime)
+        try:
+            with self.lock:
+                row = self.db.execute("SELECT size, mtime, digest FROM files WHERE path = ?", (path,)).fetchone()
+            digest = row[2] if row is not None and (row[0], row[1]) == stat else file_digest(path)
+            record = self._lookup(path, digest, stat)
+            if record is None:
+                record = read_round(path)
+                self._store(record)
+            elif row is None or row[2] != digest or (row[0], row[1]) != stat:
+                self._remember_file(path, stat, digest)
+            return record
+        except sqlite3.Error:
+            return read_round(path)
+
+    def _lookup(self, path, digest, stat):
+        with self.lock:
+            row = self.db.execute("SELECT encoding, rows, scores, placements FROM rounds WHERE digest = ?", (digest,)).fetchone()
+            if row is None:
+                return None
+            self.db.execute("UPDATE rounds SET last_used = ? WHERE digest = ?", (time.time(), digest))
+            self.db.commit()
+        scores = {name: tuple(v) for name, v in json.loads(row[2]).items()}
+        return RoundRecord(path, row[0], row[1], scores, digest, stat, json.loads(row[3]))
+
+    def _remember_file(self, path, stat, digest):
+        with self.lock:
+            self.db.execute("INSERT OR REPLACE INTO files VALUES (?, ?, ?, ?)", (path, stat[0], stat[1], digest))
+            self.db.commit()
+
+    def _store(self, record):
+        with self.lock:
+            self.db.execute("INSERT OR REPLACE INTO rounds VALUES (?, ?, ?, ?, ?, ?)",
+                            (record.digest, record.encoding, record.rows,
+                             json.dumps(record.scores, ensure_ascii=False),
+                             json.dumps(record.placements, ensure_ascii=False), time.time()))
+            self.db.execute("INSERT OR REPLACE INTO files VALUES (?, ?, ?, ?)",
+                            (os.path.abspath(record.path), record.stat[0], record.stat[1], record.digest))
+            count = self.db.execute("SELECT COUNT(*) FROM rounds").fetchone()[0]
+            if count > self.max_entries:
+                self.db.execute("DELETE FROM rounds WHERE digest IN "
+                                "(SELECT digest FROM rounds ORDER BY last_used LIMIT ?)", (count - self.max_entries,))
+                self.db.execute("DELETE FROM files WHERE digest NOT IN (SELECT digest FROM rounds)")
+            self.db.commit()
@@ -0,0 +1,151 @@
+from bisect import bisect_left, insort
+
+
+class RankingIndex:
+    """
+    Teams kept in ranking order by a numeric key tuple, highest first
+    (e.g. (total, kill)). Equal keys keep the order teams were first added.
+
+    Storage is a list of short sorted buckets with a Fenwick tree over the
+    bucket sizes, so repositioning one team, rank-of-team and the team at a
+    given rank are all O(log n) plus a bounded bucket shift, instead of
+    re-sorting the whole field after every change.
+    """
+    LOAD = 128
+
+    def __init__(self, items=()):
+        self._entries = {}   # team -> entry currently stored
+        self._order = {}     # team -> insertion number, the final tiebreak
+        self._buckets = []
+        self._maxes = []
+        self._tree = []
+        for team, key in items:
+            self.update(team, key)
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, team):
+        return team in self._entries
+
+    def __iter__(self):
+        for bucket in self._buckets:
+            for entry in bucket:
+                yield entry[-1]
+
+    def key(self, team):
+        return tuple(-v for v in self._entries[team][0])
+
+    def update(self, team, key):
+        """Inserts the team or moves it to the position for its new key."""
+        seq = self._order.setdefault(team, len(self._order))
+        entry = (tuple(-v for v in key), seq, team)
+        old = self._entries.get(team)
+        if old == entry:
+            return
+        if old is not None:
+            self._delete(old)
+        self._entries[team] = entry
+        self._insert(entry)
+
+    def discard(self, team):
+        old = self._entries.pop(team, None)
+        if old is not None:
+            self._delete(old)
+
+    def rank(self, team, ties=False):
+        """
+        1-based position of the team. With ties=True teams with equal keys
+        share the rank of the first of them (competition ranking, 1, 2, 2, 4).
+        """
+        entry = self._entries[team]
+        if ties:
+            entry = entry[:1]  # sorts before every entry with the same key
+        i = bisect_left(self._maxes, entry)
+        return self._prefix(i) + bisect_left(self._buckets[i], entry) + 1
+
+    def top(self, k):
+        return self.slice(0, k)
+
+    def slice(self, start, stop):
+        """Teams at positions start..stop-1 (0-based)."""
+        stop = min(stop, len(self))
+        if start >= stop:
+            return []
+        i, j = self._locate(start)
+        teams = []
+        while len(teams) < stop - start:
+            bucket = self._buckets[i]
+            for entry in bucket[j:j + stop - start - len(teams)]:
+                teams.append(entry[-1])
+            i, j = i + 1, 0
+        return teams
+
+    # Buckets
+
+    def _insert(self, entry):
+        if not self._buckets:
+            self._buckets.append([entry])
+            self._maxes.append(entry)
+            self._rebuild()
+            return
+        i = min(bisect_left(self._maxes, entry), len(self._maxes) - 1)
+        bucket = self._buckets[i]
+        insort(bucket, entry)
+        self._maxes[i] = bucket[-1]
+        if len(bucket) > 2 * self.LOAD:
+            self._buckets[i:i + 1] = [bucket[:self.LOAD], bucket[self.LOAD:]]
+            self._maxes[i:i + 1] = [bucket[self.LOAD - 1], bucket[-1]]
+            self._rebuild()
+        else:
+            self._add(i, 1)
+
+    def _delete(self, entry):
+        i = bisect_left(self._maxes, entry)
+        bucket = self._buckets[i]
+        del bucket[bisect_left(bucket, entry)]
+        if bucket:
+            self._maxes[i] = bucket[-1]
+            self._add(i, -1)
+        else:
+            del self._buckets[i]
+            del self._maxes[i]
+            self._rebuild()
+
+    # Fenwick tree over bucket sizes
+
+    def _rebuild(self):
+        n = len(self._buckets)
+        tree = [0] * (n + 1)
+        for i, bucket in enumerate(self._buckets, 1):
+            tree[i] += len(bucket)
+            parent = i + (i & -i)
+            if parent <= n:
+                tree[parent] += tree[i]
+        self._tree = tree
+
+    def _add(self, i, delta):
+        i += 1
+        while i < len(self._tree):
+            self._tree[i] += delta
+            i += i & -i
+
+    def _prefix(self, i):
+        """Number of teams in buckets before bucket i."""
+        total = 0
+        while i > 0:
+            total += self._tree[i]
+            i -= i & -i
+        return total
+
+    def _locate(self, pos):
+        """(bucket, offset) of the 0-based position pos."""
+        i = 0
+        step = 1 << (len(self._tree) - 1).bit_length()
+        while step:
+            nxt = i + step
+            if nxt < len(self._tree) and self._tree[nxt] <= pos:
+                i = nxt
+                pos -= self._tree[nxt]
+            step >>= 1
+        return i, pos
@@ -0,0 +1,111 @@
+import os
+import threading
+import time
+
+from round_reader import RoundFileError, read_round
+
+
+class ResultsWatcher:
+    """
+    Polls a folder for new result CSV files and hands each finished file to
+    on_round(record) in the order the files appeared. A file counts as finished
+    once its size and mtime stayed the same for `settle` polls and it parses;
+    files the game is still writing (or has locked) are retried on later polls,
+    and one that is still not finished after `give_up` polls goes to
+    on_error(path, exception) instead. A file that is empty or fails to parse
+    for `stall` polls in a row stops holding back newer files (it is still
+    retried until `give_up`), so one stuck file cannot delay the next round.
+    Files already in the folder when the watcher starts are ignored.
+    """
+
+    def __init__(self, folder, on_round, on_error=None, interval=0.25, settle=2, give_up=40, stall=2, reader=read_round):
+        self.folder = folder
+        self.reader = reader
+        self.on_round = on_round
+        self.on_error = on_error
+        self.interval = interval
+        self.settle = settle
+        self.give_up = give_up
+        self.stall = stall
+        self.seen = set(self._scan())
+        self.pending = {}   # path -> {'stat': (size, mtime), 'stable': int, 'tries': int, 'stuck': int, 'first': mtime when seen}
+        self.stop_event = threading.Event()
+        self.thread = None
+
+    def _scan(self):
+        try:
+            with os.scandir(self.folder) as it:
+                return [os.path.abspath(e.path) for e in it if e.is_file() and e.name.lower().endswith('.csv')]
+        except OSError:
+            return []
+
+    def poll(self):
+        """Checks the folder once and delivers every file that is ready, oldest first."""
+        for path in self._scan():
+            if path not in self.seen:
+                self.seen.add(path)
+                try:
+                    first = os.stat(path).st_mtime
+                except OSError:
+                    first = time.time()
+                self.pending[path] = {'stat': None, 'stable': 0, 'tries': 0, 'stuck': 0, 'first': first}
+
+        ready = {}
+        for path, state in self.pending.items():
+            try:
+                st = os.stat(path)
+            except OSError:
+                ready[path] = None  # deleted before it was finished
+                continue
+            stat = (st.st_size, st.st_mtime)
+            if stat != state['stat'] or st.st_size == 0:
+                state['stat'] = stat
+                state['stable'] = 0
+                state['stuck'] = state['stuck'] + 1 if st.st_size == 0 else 0
+                error = RoundFileError("file is empty" if st.st_size == 0 else "file never stopped changing")
+            else:
+                state['stable'] += 1
+                if state['stable'] < self.settle:
+                    continue
+                try:
+                    ready[path] = self.reader(path)
+                    continue
+                except Exception as e:
+                    # Locked or half written: try again later
+                    state['stuck'] += 1
+                    error = e
+            # Every poll that does not settle counts, so a stuck file (e.g. an
+            # empty one) is reported and skipped instead of holding back newer files
+            state['tries'] += 1
+            if state['tries'] >= self.give_up:
+                ready[path] = error
+
+        # Deliver in arrival order, holding newer files back until older ones are
+        # done, except behind a file that has been stuck for `stall` polls
+        order = sorted(self.pending, key=lambda p: (self.pending[p]['first'], p))
+        for path in order:
+            if path not in ready:
+                if self.pending[path]['stuck'] >= self.stall:
+                    continue
+                break
+            del self.pending[path]
+            result = ready[path]
+            if result is None:
+                continue
+            if isinstance(result, Exception):
+                if self.on_error: self.on_error(path, result)
+            else:
+                self.on_round(result)
+
+    def run(self):
+        while not self.stop_event.is_set():
+            self.poll()
+            self.stop_event.wait(self.interval)
+
+    def start(self):
+        """Runs the watcher on a daemon thread; callbacks are invoked on that thread."""
+        self.thread = threading.Thread(target=self.run, daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        self.stop_event.set()
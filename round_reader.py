@@ -0,0 +1,184 @@
+import codecs
+import csv
+import hashlib
+import io
+import os
+import sys
+import time
+from collections import namedtuple
+
+from stage_timer import TIMER
+
+# Only these columns of the ER result export are used for standings
+TEAM_COLUMN = 'teamName'
+TOTAL_COLUMN = 'tournament total score'
+KILL_COLUMN = 'tournament kill score'
+# In-game placement, kept for placement tiebreaks
+PLACEMENT_COLUMN = 'rank'
+
+SNIFF_BYTES = 64 * 1024
+
+# scores: { 'TeamName': (total, kill) }, digest: sha1 of the file bytes, stat: (size, mtime),
+# placements: { 'TeamName': in-game placement } for teams with one (empty without the column)
+RoundRecord = namedtuple('RoundRecord', ['path', 'encoding', 'rows', 'scores', 'digest', 'stat', 'placements'])
+
+
+class RoundFileError(ValueError):
+    """Raised when a result file has no readable team rows."""
+
+
+class _HashingReader(io.RawIOBase):
+    """Raw stream that feeds every byte read through it into a sha1."""
+
+    def __init__(self, raw):
+        self.raw = raw
+        self.hash = hashlib.sha1()
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        n = self.raw.readinto(buffer)
+        if n:
+            self.hash.update(memoryview(buffer)[:n])
+        return n
+
+
+def normalize_name(name):
+    """Normalize whitespace in names."""
+    return ' '.join(name.split())
+
+
+def detect_encoding(prefix):
+    """
+    Guesses the encoding of a result file from its first bytes.
+    Exports are either UTF-8 (usually with BOM) or cp949 from Korean Windows.
+    """
+    if prefix.startswith(codecs.BOM_UTF8):
+        return 'utf-8-sig'
+    try:
+        # final=False so a multibyte character cut at the prefix end is not an error
+        codecs.getincrementaldecoder('utf-8')().decode(prefix, final=False)
+        return 'utf-8'
+    except UnicodeDecodeError:
+        return 'cp949'
+
+
+def parse_rows(rows):
+    """
+    Reads team scores from an iterator of CSV rows (header first).
+    Returns (row_count, { 'TeamName': (total, kill) }, { 'TeamName': placement }).
+    """
+    try:
+        return _parse_rows(rows)
+    except csv.Error as e:
+        # e.g. an unterminated quote swallowing the rest of the file
+        raise RoundFileError(f"malformed CSV ({e})")
+
+
+def _parse_rows(rows):
+    header = next(rows, None)
+    if not header:
+        raise RoundFileError("file is empty")
+    header = [name.strip() for name in header]
+    if TEAM_COLUMN not in header:
+        raise RoundFileError(f"'{TEAM_COLUMN}' column not found")
+
+    team_idx = header.index(TEAM_COLUMN)
+    total_idx = header.index(TOTAL_COLUMN) if TOTAL_COLUMN in header else None
+    kill_idx = header.index(KILL_COLUMN) if KILL_COLUMN in header else None
+    place_idx = header.index(PLACEMENT_COLUMN) if PLACEMENT_COLUMN in header else None
+
+    def cell(row, idx):
+        if idx is None or idx >= len(row):
+            return 0.0
+        return float(row[idx].strip() or 0)
+
+    scores = {}
+    placements = {}
+    count = 0
+    for row in rows:
+        count += 1
+        if team_idx >= len(row):
+            continue
+        name = normalize_name(row[team_idx])
+        if not name:
+            continue
+        try:
+            scores[name] = (cell(row, total_idx), cell(row, kill_idx))
+        except ValueError:
+            continue
+        try:
+            place = cell(row, place_idx)
+        except ValueError:
+            place = 0.0
+        if place > 0:
+            placements[name] = place
+
+    if not scores:
+        raise RoundFileError("no team rows found")
+    return count, scores, placements
+
+
+@TIMER.timed('read_round')
+def read_round(path):
+    """
+    Reads one result file in a single pass and returns a RoundRecord.
+    The encoding is sniffed from a bounded prefix; only if a UTF-8 guess
+    turns out wrong further down the file is it read again as cp949.
+    """
+    with open(path, 'rb', buffering=0) as f:
+        st = os.fstat(f.fileno())
+        hashing = _HashingReader(f)
+        raw = io.BufferedReader(hashing, SNIFF_BYTES)
+        encoding = detect_encoding(raw.peek(SNIFF_BYTES)[:SNIFF_BYTES])
+        text = io.TextIOWrapper(raw, encoding=encoding, newline='')
+        try:
+            count, scores, placements = parse_rows(csv.reader(text))
+            text.read()
+            return RoundRecord(path, encoding, count, scores, hashing.hash.hexdigest(), (st.st_size, st.st_mtime), placements)
+        except UnicodeDecodeError:
+            if encoding == 'cp949':
+                raise RoundFileError("unsupported encoding")
+        finally:
+            text.detach()
+
+    with TIMER.stage('encoding retry'), open(path, 'r', encoding='cp949', newline='') as text:
+        try:
+            count, scores, placements = parse_rows(csv.reader(text))
+        except UnicodeDecodeError:
+            raise RoundFileError("unsupported encoding")
+    return RoundRecord(path, 'cp949', count, scores, file_digest(path), (st.st_size, st.st_mtime), placements)
+
+
+def file_digest(path):
+    """sha1 of a file's bytes, the same value as RoundRecord.digest."""
+    digest = hashlib.sha1()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(SNIFF_BYTES), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def main():
+    # Throughput check: python round_reader.py <csv files...>
+    paths = sys.argv[1:]
+    if not paths:
+        print("Usage: python round_reader.py <csv files...>")
+        return
+
+    total_bytes = 0
+    total_rows = 0
+    start = time.perf_counter()
+    for path in paths:
+        record = read_round(path)
+        total_bytes += os.path.getsize(path)
+        total_rows += record.rows
+    elapsed = max(time.perf_counter() - start, 1e-9)
+
+    print(f"{len(paths)} files, {total_rows} rows, {total_bytes / 1e6:.2f} MB in {elapsed * 1000:.1f} ms")
+    print(f"{total_rows / elapsed:,.0f} rows/s, {total_bytes / 1e6 / elapsed:.1f} MB/s")
+
+
+if __name__ == "__main__":
+    main()
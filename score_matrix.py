@@ -0,0 +1,129 @@
+from array import array
+
+try:
+    import numpy as np
+except ImportError:  # numpy is optional; plain Python loops are used instead
+    np = None
+
+from stage_timer import TIMER
+
+
+class ScoreMatrix:
+    """
+    Teams x rounds score store. Team names are interned to integer ids (base
+    round first) and every round is one array('d') column of totals and one of
+    kills, indexed by team id. Teams missing from a round score 0 there.
+    Cumulative totals and per-round rank history are computed with numpy when
+    it is installed.
+    """
+
+    def __init__(self, teams=()):
+        self.teams = []     # id -> name
+        self.ids = {}       # name -> id
+        self.totals = []    # one array('d') per round
+        self.kills = []
+        for name in teams:
+            self.intern(name)
+
+    @property
+    def rounds(self):
+        return len(self.totals)
+
+    def intern(self, name):
+        team_id = self.ids.get(name)
+        if team_id is None:
+            team_id = self.ids[name] = len(self.teams)
+            self.teams.append(name)
+            for column in self.totals + self.kills:
+                column.append(0.0)
+        return team_id
+
+    @TIMER.timed('score matrix')
+    def add_round(self, scores):
+        """Appends a round from { 'TeamName': (total, kill) }."""
+        for name in scores:
+            self.intern(name)
+        totals = array('d', bytes(8 * len(self.teams)))
+        kills = array('d', bytes(8 * len(self.teams)))
+        for name, (t, k) in scores.items():
+            team_id = self.ids[name]
+            totals[team_id] = t
+            kills[team_id] = k
+        self.totals.append(totals)
+        self.kills.append(kills)
+
+    def remove_round(self, index):
+        del self.totals[index]
+        del self.kills[index]
+
+    def move_round(self, src, dst):
+        self.totals.insert(dst, self.totals.pop(src))
+        self.kills.insert(dst, self.kills.pop(src))
+
+    def round_scores(self, index, team_ids=None):
+        """Returns (totals, kills) of one round as lists, optionally for a subset of team ids."""
+        totals, kills = self.totals[index], self.kills[index]
+        if team_ids is None:
+            return list(totals), list(kills)
+        return [totals[i] for i in team_ids], [kills[i] for i in team_ids]
+
+    def cumulative(self, team_ids=None):
+        """
+        Running totals after each round.
+        Returns (totals, kills), each rounds x teams (numpy arrays or lists of lists).
+        """
+        if np is not None:
+            totals = np.array(self.totals, dtype=float).reshape(self.rounds, len(self.teams))
+            kills = np.array(self.kills, dtype=float).reshape(self.rounds, len(self.teams))
+            if team_ids is not None:
+                totals, kills = totals[:, team_ids], kills[:, team_ids]
+            return totals.cumsum(axis=0), kills.cumsum(axis=0)
+
+        ids = range(len(self.teams)) if team_ids is None else team_ids
+        cum_totals, cum_kills = [], []
+        running_t = [0.0] * len(ids)
+        running_k = [0.0] * len(ids)
+        for r in range(self.rounds):
+            totals, kills = self.totals[r], self.kills[r]
+            running_t = [running_t[j] + totals[i] for j, i in enumerate(ids)]
+            running_k = [running_k[j] + kills[i] for j, i in enumerate(ids)]
+            cum_totals.append(running_t)
+            cum_kills.append(running_k)
+        return cum_totals, cum_kills
+
+    def rank_history(self, team_ids=None, adjust=None):
+        """
+        Rank (1 = first) of every team after each round, ordered by (total, kill)
+        descending. `adjust` is subtracted from the totals of the latest round,
+        e.g. penalties that are not tied to a round.
+        Returns a rounds x teams structure (numpy int array or lists).
+        """
+        totals, kills = self.cumulative(team_ids)
+        if self.rounds == 0:
+            return totals
+        if np is not None:
+            if adjust is not None:
+                totals[-1] -= np.asarray(adjust, dtype=float)
+            # lexsort sorts by the last key first, along the last axis of every round
+            order = np.lexsort((-kills, -totals), axis=-1)
+            ranks = np.empty_like(order)
+            ranks[np.arange(order.shape[0])[:, None], order] = np.arange(1, order.shape[1] + 1)
+            return ranks
+
+        if adjust is not None:
+            totals[-1] = [t - a for t, a in zip(totals[-1], adjust)]
+        history = []
+        for row_t, row_k in zip(totals, kills):
+            order = sorted(range(len(row_t)), key=lambda j: (-row_t[j], -row_k[j]))
+            ranks = [0] * len(row_t)
+            for rank, j in enumerate(order, 1):
+                ranks[j] = rank
+            history.append(ranks)
+        return history
+
+    def movement(self, team_ids=None, adjust=None):
+        """Places gained (positive) or lost in the latest round, per team."""
+        history = self.rank_history(team_ids, adjust)
+        if self.rounds < 2:
+            return [0] * (len(self.teams) if team_ids is None else len(team_ids))
+        return [int(a) - int(b) for a, b in zip(history[-2], history[-1])]
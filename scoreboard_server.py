@@ -0,0 +1,226 @@
+import asyncio
+import hashlib
+import json
+import threading
+
+OVERLAY_HTML = """<!DOCTYPE html>
+<html lang="ko">
+<head>
+<meta charset="utf-8">
+<title>ER Tournament Ranking</title>
+<style>
+  body { margin: 0; background: transparent; font-family: "Malgun Gothic", sans-serif; color: #2C3E50; }
+  table { border-collapse: collapse; min-width: 420px; background: rgba(255, 255, 255, 0.9); }
+  th, td { padding: 6px 12px; text-align: center; }
+  th { background: #434A54; color: white; }
+  td.team { text-align: left; }
+  tr.checkpoint td { background: #FFF9C4; }
+</style>
+</head>
+<body>
+<table>
+  <thead><tr><th>순위</th><th>팀 이름</th><th>종합 점수</th><th>킬 점수</th></tr></thead>
+  <tbody id="rows"></tbody>
+</table>
+<script>
+function render(data) {
+  const body = document.getElementById("rows");
+  body.replaceChildren(...data.standings.map(t => {
+    const tr = document.createElement("tr");
+    if (t.checkpoint) tr.className = "checkpoint";
+    for (const [value, cls] of [[t.rank, ""], [t.team, "team"], [t.total.toFixed(1), ""], [t.kill.toFixed(1), ""]]) {
+      const td = document.createElement("td");
+      td.textContent = value;
+      if (cls) td.className = cls;
+      tr.appendChild(td);
+    }
+    return tr;
+  }));
+}
+const limit = new URLSearchParams(location.search).get("top");
+fetch("standings.json" + (limit ? "?top=" + limit : "")).then(r => r.json()).then(render);
+const events = new EventSource("events" + (limit ? "?top=" + limit : ""));
+events.onmessage = e => render(JSON.parse(e.data));
+</script>
+</body>
+</html>
+"""
+
+
+class ScoreboardServer:
+    """
+    Small asyncio HTTP server for broadcast overlays, run on its own thread.
+
+      /                 HTML overlay (add ?top=N to limit rows)
+      /standings.json   current standings, with ETag / If-None-Match support
+      /events           Server-Sent Events stream, one message per update
+
+    The owner calls publish(standings) from any thread. Each version is
+    rendered to bytes once and shared by every client, so polling clients cost
+    a dictionary lookup and unchanged polls get 304 Not Modified.
+    """
+
+    def __init__(self, host='127.0.0.1', port=8765):
+        self.host = host
+        self.port = port
+        self.loop = None
+        self.server = None
+        self.thread = None
+        self.version = 0
+        self.standings = []
+        self.rendered = {}      # top -> (etag, body) for the current version
+        self.listeners = set()  # asyncio.Queue per SSE client
+        self.handlers = set()   # running connection tasks, cancelled on stop()
+        self.ready = threading.Event()
+
+    def start(self):
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+        self.ready.wait(5)
+        if self.server is None:
+            raise OSError(f"could not listen on {self.host}:{self.port}")
+
+    def stop(self):
+        """Closes every connection, stops the loop and waits for the thread, so the port is free on return."""
+        if self.thread is None:
+            return
+        if self.loop is not None and self.loop.is_running():
+            asyncio.run_coroutine_threadsafe(self._shutdown(), self.loop)
+        self.thread.join(5)
+        self.thread = None
+
+    def publish(self, standings):
+        """standings: [{'rank', 'team', 'total', 'kill', 'penalty', 'checkpoint'}] in rank order."""
+        if self.loop is not None:
+            self.loop.call_soon_threadsafe(self._publish, list(standings))
+
+    def _run(self):
+        self.loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self.loop)
+        try:
+            self.server = self.loop.run_until_complete(
+                asyncio.start_server(self._handle, self.host, self.port))
+        except OSError:
+            self.ready.set()
+            return
+        self.ready.set()
+        try:
+            self.loop.run_forever()
+        finally:
+            self.server.close()
+            self.loop.close()
+
+    async def _shutdown(self):
+        self.server.close()
+        # Open SSE streams would otherwise be destroyed while still pending
+        for task in self.handlers:
+            task.cancel()
+        await asyncio.gather(*self.handlers, return_exceptions=True)
+        await self.server.wait_closed()
+        self.loop.stop()
+
+    # Rendering
+
+    def _publish(self, standings):
+        self.version += 1
+        self.standings = standings
+        self.rendered = {}
+        for queue in self.listeners:
+            queue.put_nowait(self.version)
+
+    def _render(self, top):
+        cached = self.rendered.get(top)
+        if cached is None:
+            rows = self.standings if top is None else self.standings[:top]
+            body = json.dumps({'version': self.version, 'standings': rows}, ensure_ascii=False).encode('utf-8')
+            etag = '"%d-%s"' % (self.version, hashlib.sha1(body).hexdigest()[:12])
+            cached = self.rendered[top] = (etag, body)
+        return cached
+
+    # HTTP
+
+    async def _handle(self, reader, writer):
+        task = asyncio.current_task()
+        self.handlers.add(task)
+        try:
+            await self._serve(reader, writer)
+        except asyncio.CancelledError:
+            # Cancelled by _shutdown; finishing normally keeps asyncio from logging it
+            writer.close()
+        finally:
+            self.handlers.discard(task)
+
+    async def _serve(self, reader, writer):
+        try:
+            request = await reader.readuntil(b'\r\n\r\n')
+        except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, ConnectionError):
+            writer.close()
+            return
+        lines = request.decode('latin-1').split('\r\n')
+        parts = lines[0].split(' ')
+        if len(parts) < 2 or parts[0] != 'GET':
+            await self._respond(writer, 405, 'text/plain', b'Method Not Allowed')
+            return
+        headers = {}
+        for line in lines[1:]:
+            name, _, value = line.partition(':')
+            headers[name.strip().lower()] = value.strip()
+
+        path, _, query = parts[1].partition('?')
+        top = None
+        for pair in query.split('&'):
+            key, _, value = pair.partition('=')
+            if key == 'top' and value.isdigit():
+                top = int(value)
+
+        if path == '/':
+            await self._respond(writer, 200, 'text/html; charset=utf-8', OVERLAY_HTML.encode('utf-8'))
+        elif path == '/standings.json':
+            etag, body = self._render(top)
+            if headers.get('if-none-match') == etag:
+                await self._respond(writer, 304, None, b'', {'ETag': etag})
+            else:
+                await self._respond(writer, 200, 'application/json; charset=utf-8', body, {'ETag': etag})
+        elif path == '/events':
+            await self._stream(writer, top)
+        else:
+            await self._respond(writer, 404, 'text/plain', b'Not Found')
+
+    async def _respond(self, writer, status, content_type, body, extra=None):
+        reason = {200: 'OK', 304: 'Not Modified', 404: 'Not Found', 405: 'Method Not Allowed'}[status]
+        head = [f"HTTP/1.1 {status} {reason}", f"Content-Length: {len(body)}",
+                "Cache-Control: no-cache", "Access-Control-Allow-Origin: *", "Connection: close"]
+        if content_type:
+            head.append(f"Content-Type: {content_type}")
+        for name, value in (extra or {}).items():
+            head.append(f"{name}: {value}")
+        writer.write(('\r\n'.join(head) + '\r\n\r\n').encode('latin-1') + body)
+        try:
+            await writer.drain()
+        except ConnectionError:
+            pass
+        writer.close()
+
+    async def _stream(self, writer, top):
+        queue = asyncio.Queue()
+        self.listeners.add(queue)
+        writer.write(b"HTTP/1.1 200 OK\r\nContent-Type: text/event-stream\r\n"
+                     b"Cache-Control: no-cache\r\nAccess-Control-Allow-Origin: *\r\n\r\n")
+        try:
+            sent = None
+            while True:
+                if sent != self.version:
+                    sent = self.version
+                    _, body = self._render(top)
+                    writer.write(b'data: ' + body + b'\n\n')
+                    await writer.drain()
+                try:
+                    await asyncio.wait_for(queue.get(), timeout=15)
+                except asyncio.TimeoutError:
+                    writer.write(b': keep-alive\n\n')
+                    await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            self.listeners.discard(queue)
+            writer.close()
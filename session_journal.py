@@ -0,0 +1,95 @@
+import json
+import os
+
+
+class SessionJournal:
+    """
+    Crash-safe record of a GUI session, kept in `folder`:
+
+    - journal.jsonl: one JSON event per line, appended and flushed as it happens
+    - snapshot.json: the full session state every `snapshot_every` events
+
+    Every event carries a sequence number and the snapshot stores the last one
+    it covers, so restoring is "load the snapshot, replay the newer events" and
+    never has to go further back than one snapshot interval.
+    """
+
+    def __init__(self, folder, snapshot_every=50):
+        self.folder = folder
+        self.snapshot_every = snapshot_every
+        self.journal_path = os.path.join(folder, 'journal.jsonl')
+        self.snapshot_path = os.path.join(folder, 'snapshot.json')
+        self.seq = 0
+        self.since_snapshot = 0
+        self.file = None
+
+    def exists(self):
+        for path in (self.snapshot_path, self.journal_path):
+            if os.path.exists(path) and os.path.getsize(path) > 0:
+                return True
+        return False
+
+    def open(self):
+        os.makedirs(self.folder, exist_ok=True)
+        self.file = open(self.journal_path, 'a', encoding='utf-8')
+
+    def append(self, event):
+        """Writes one event; returns True when a snapshot is due."""
+        self.seq += 1
+        event = dict(event, seq=self.seq)
+        self.file.write(json.dumps(event, ensure_ascii=False) + '\n')
+        self.file.flush()
+        self.since_snapshot += 1
+        return self.since_snapshot >= self.snapshot_every
+
+    def snapshot(self, state):
+        """Replaces the snapshot with `state` and starts an empty journal."""
+        tmp = self.snapshot_path + '.tmp'
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump({'seq': self.seq, 'state': state}, f, ensure_ascii=False)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, self.snapshot_path)
+        # A crash before this truncation only leaves events the snapshot already covers
+        self.file.close()
+        self.file = open(self.journal_path, 'w', encoding='utf-8')
+        self.since_snapshot = 0
+
+    def load(self):
+        """Returns (state or None, [events newer than the snapshot])."""
+        state = None
+        last = 0
+        try:
+            with open(self.snapshot_path, encoding='utf-8') as f:
+                snap = json.load(f)
+            state, last = snap['state'], snap['seq']
+        except (OSError, ValueError, KeyError):
+            pass
+
+        events = []
+        try:
+            with open(self.journal_path, encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        event = json.loads(line)
+                    except ValueError:
+                        break  # torn last line from a crash
+                    if event.get('seq', 0) > last:
+                        events.append(event)
+        except OSError:
+            pass
+
+        self.seq = max([last] + [e['seq'] for e in events])
+        return state, events
+
+    def clear(self):
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+        for path in (self.snapshot_path, self.journal_path):
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+        self.seq = 0
+        self.since_snapshot = 0
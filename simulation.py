@@ -0,0 +1,166 @@
+from concurrent.futures import ProcessPoolExecutor
+
+try:
+    import numpy as np
+except ImportError:  # numpy is optional; simulation needs it
+    np = None
+
+from stage_timer import TIMER
+
+# Monte Carlo outlook
+# Each simulated tournament plays the remaining rounds by drawing, for every
+# team and round independently, one of the rounds that team has already
+# played (its total and kill score together), i.e. sampling from the team's
+# own empirical per-round distribution. Final standings sort by total, then
+# kills, then the current order. The checkpoint race uses the same model as
+# checkpoint.py: the first `slots` teams to reach the score pass, teams that
+# reach it after the same round ordered by total, then kills.
+#
+# Scores are compared to 0.01: total and kills are packed into one int64 key
+# (total * M + kill), so a round's gain is a single lookup and a tournament's
+# standings a single integer sort.
+
+SCALE = 100
+CELLS = 1_000_000   # sampled team-rounds held in memory per chunk
+
+
+@TIMER.timed('simulate')
+def simulate(totals, kills, round_totals, round_kills, remaining, sims=200_000, top=3,
+             checkpoint=None, seed=None, processes=1):
+    """
+    totals, kills: current score per team, in current ranking order.
+    round_totals, round_kills: rounds x teams scores already played.
+    checkpoint: optional {'score', 'slots', 'crossed', 'crossed_total'} where
+    crossed[j] is the round team j reached the score (None if not yet) and
+    crossed_total[j] its total then.
+
+    Returns per-team arrays in the same order: {'expected' (mean finish,
+    1-based), 'first' (P(winning)), 'top' (P(finish <= top)), 'checkpoint'
+    (P(passing) or None)}, plus 'sims'.
+    """
+    if np is None:
+        raise RuntimeError("numpy is required for simulation")
+    job = _Job(totals, kills, round_totals, round_kills, remaining, top, checkpoint)
+    seeds = np.random.SeedSequence(seed).spawn(max(1, processes))
+    shares = [sims // len(seeds) + (1 if i < sims % len(seeds) else 0) for i in range(len(seeds))]
+    if len(seeds) == 1:
+        parts = [job.run(shares[0], seeds[0])]
+    else:
+        with ProcessPoolExecutor(max_workers=len(seeds)) as pool:
+            parts = list(pool.map(job.run, shares, seeds))
+
+    total = {name: sum(p[name] for p in parts) / max(sims, 1) for name in parts[0]}
+    return {
+        'sims': sims,
+        'expected': total['rank_sum'] + 1,
+        'first': total['first'],
+        'top': total['top'],
+        'checkpoint': total['passed'] if checkpoint is not None else None,
+    }
+
+
+def default_sims(teams, remaining):
+    """200k simulations for a usual field, fewer for very large ones so a run stays around a second."""
+    return max(10_000, min(200_000, 60_000_000 // max(1, teams * max(remaining, 1))))
+
+
+class _Job:
+    """Picklable simulation setup; run() plays `sims` tournaments and returns raw counts."""
+
+    def __init__(self, totals, kills, round_totals, round_kills, remaining, top, checkpoint):
+        n = len(totals)
+        totals = _scaled(totals)
+        kills = _scaled(kills)
+        round_totals = _scaled(round_totals).reshape(len(round_totals), n)
+        round_kills = _scaled(round_kills).reshape(len(round_kills), n)
+        # Every reachable kill score lies in [low, low + M), so packed keys compare like (total, kill)
+        rest = max(remaining, 0)
+        low = int((kills + rest * round_kills.min(axis=0, initial=0)).min(initial=0))
+        high = int((kills + rest * round_kills.max(axis=0, initial=0)).max(initial=0))
+        self.m = high - low + 1
+        self.current = totals * self.m + kills - low
+        self.kills = kills - low
+        # Sampled per team, so stored team-major: table[j * rounds + r]
+        self.rounds = len(round_totals)
+        self.table = (round_totals * self.m + round_kills).T.ravel()
+        self.remaining = remaining
+        self.top = top
+        self.checkpoint = checkpoint
+        if checkpoint is not None:
+            # Teams already past the score keep their real crossing round, ahead of any future one
+            self.never = self.rounds + max(remaining, 0)
+            self.threshold = int(np.ceil(checkpoint['score'] * SCALE - 1e-6)) * self.m
+            self.crossed = np.array([self.never if r is None else r for r in checkpoint['crossed']], dtype=np.int64)
+            self.at_cross = np.array([0 if t is None else t for t in checkpoint['crossed_total']], dtype=float)
+            self.at_cross = _scaled(self.at_cross) * self.m + self.kills
+
+    def run(self, sims, seed):
+        rng = np.random.default_rng(seed)
+        n = len(self.current)
+        counts = {name: np.zeros(n, dtype=np.int64) for name in ('rank_sum', 'first', 'top', 'passed')}
+        if n == 0:
+            return counts
+        chunk = max(1, CELLS // max(1, n))
+        # Current order breaks full ties, folded into the key so a plain (unstable) sort is enough
+        order_bits = np.arange(n - 1, -1, -1)
+        done = 0
+        while done < sims:
+            size = min(chunk, sims - done)
+            keys, crossed, at_cross = self._play(rng, size)
+            order = np.argsort(-(keys * n + order_bits), axis=1)
+            # order[s, k] is the team finishing k-th; invert to each team's finish
+            ranks = np.empty_like(order)
+            np.put_along_axis(ranks, order, np.arange(n), axis=1)
+            counts['rank_sum'] += ranks.sum(axis=0)
+            counts['first'] += np.bincount(order[:, 0], minlength=n)
+            counts['top'] += np.bincount(order[:, :self.top].ravel(), minlength=n)
+            if self.checkpoint is not None:
+                counts['passed'] += self._passed(crossed, at_cross, keys)
+            done += size
+        return counts
+
+    def _play(self, rng, size):
+        """
+        Plays the remaining rounds of `size` tournaments, one round at a time so
+        every step works on contiguous sims x teams arrays. Returns the final
+        keys and, for the checkpoint, the round each team reached the score
+        (`never` if it did not) and its key right then.
+        """
+        n = len(self.current)
+        keys = np.tile(self.current, (size, 1))
+        crossed = at_cross = None
+        if self.checkpoint is not None:
+            crossed = np.tile(self.crossed, (size, 1))
+            at_cross = np.tile(self.at_cross, (size, 1))
+        if self.rounds == 0 or n == 0:
+            return keys, crossed, at_cross
+
+        base = np.arange(n) * self.rounds
+        dtype = np.int16 if self.rounds < 2 ** 15 else np.int64
+        for r in range(self.remaining):
+            keys += self.table[base + rng.integers(0, self.rounds, size=(size, n), dtype=dtype)]
+            if crossed is not None:
+                now = (crossed == self.never) & (keys >= self.threshold)
+                np.copyto(crossed, self.rounds + r, where=now)
+                np.copyto(at_cross, keys, where=now)
+        return keys, crossed, at_cross
+
+    def _passed(self, crossed, at_cross, keys):
+        """Per team, in how many of these simulations it got one of the checkpoint slots."""
+        size, n = crossed.shape
+        slots = min(self.checkpoint['slots'], n)
+        if slots <= 0:
+            return np.zeros(n, dtype=np.int64)
+        # Earlier crossing first, then the higher (total, kill) at that point
+        span = int(max(self.current.max(initial=0), keys.max(initial=0))) + 1
+        order = crossed * span - at_cross
+        if slots < n:
+            winners = np.argpartition(order, slots - 1, axis=1)[:, :slots]
+        else:
+            winners = np.broadcast_to(np.arange(n), (size, n))
+        valid = np.take_along_axis(crossed, winners, axis=1) < self.never
+        return np.bincount(winners[valid], minlength=n)
+
+
+def _scaled(values):
+    return np.rint(np.asarray(values, dtype=float) * SCALE).astype(np.int64)
@@ -0,0 +1,130 @@
+import functools
+import json
+import threading
+import time
+import tracemalloc
+
+
+class _Stage:
+    __slots__ = ('timer', 'name', 'start', 'memory')
+
+    def __init__(self, timer, name):
+        self.timer = timer
+        self.name = name
+
+    def __enter__(self):
+        local = self.timer.local
+        local.depth = getattr(local, 'depth', 0) + 1
+        self.memory = tracemalloc.get_traced_memory()[0] if self.timer.trace_memory else None
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        elapsed = time.perf_counter() - self.start
+        allocated = tracemalloc.get_traced_memory()[0] - self.memory if self.memory is not None else 0
+        self.timer.local.depth -= 1
+        outermost = self.timer.local.depth == 0 and threading.current_thread() is threading.main_thread()
+        self.timer.record(self.name, elapsed, allocated, outermost)
+        return False
+
+
+class _NullStage:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL = _NullStage()
+
+
+class StageTimer:
+    """
+    Cumulative wall time per named stage, plus the net memory each stage left
+    allocated when tracemalloc tracking is on.
+
+    Stages may nest and may run on worker threads. While disabled, entering a
+    stage is a single attribute check, so the hooks stay in the hot paths.
+    `last` is the most recent outermost stage finished on the main thread as
+    (name, seconds), i.e. the latency of the last whole user-facing operation
+    rather than one of its parts or a background read.
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self.trace_memory = False
+        self.stats = {}   # name -> [calls, seconds, max seconds, bytes]
+        self.last = None
+        self.lock = threading.Lock()
+        self.local = threading.local()
+
+    def enable(self, memory=False):
+        self.enabled = True
+        if memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+        self.trace_memory = memory
+
+    def disable(self):
+        self.enabled = False
+        if self.trace_memory:
+            tracemalloc.stop()
+            self.trace_memory = False
+
+    def reset(self):
+        with self.lock:
+            self.stats = {}
+            self.last = None
+
+    def stage(self, name):
+        """Context manager timing one run of the stage `name`."""
+        return _Stage(self, name) if self.enabled else _NULL
+
+    def timed(self, name):
+        """Decorator form of stage()."""
+        def decorate(fn):
+            @functools.wraps(fn)
+            def wrapper(*args, **kwargs):
+                if not self.enabled:
+                    return fn(*args, **kwargs)
+                with _Stage(self, name):
+                    return fn(*args, **kwargs)
+            return wrapper
+        return decorate
+
+    def record(self, name, seconds, allocated=0, outermost=True):
+        with self.lock:
+            entry = self.stats.get(name)
+            if entry is None:
+                entry = self.stats[name] = [0, 0.0, 0.0, 0]
+            entry[0] += 1
+            entry[1] += seconds
+            entry[2] = max(entry[2], seconds)
+            entry[3] += allocated
+            if outermost:
+                self.last = (name, seconds)
+
+    def report(self):
+        """Per-stage breakdown as printable lines, slowest stage first."""
+        with self.lock:
+            items = sorted(self.stats.items(), key=lambda item: -item[1][1])
+        lines = [f"{'Stage':<24}{'Calls':>8}{'Total ms':>12}{'Mean ms':>10}{'Max ms':>10}{'Alloc KiB':>12}"]
+        for name, (calls, seconds, longest, allocated) in items:
+            alloc = f"{allocated / 1024:>12.1f}" if self.trace_memory else f"{'-':>12}"
+            lines.append(f"{name:<24}{calls:>8}{seconds * 1000:>12.2f}"
+                         f"{seconds * 1000 / calls:>10.3f}{longest * 1000:>10.3f}{alloc}")
+        return lines
+
+    def dump(self, path):
+        with self.lock:
+            stats = {name: {'calls': calls, 'total_ms': seconds * 1000, 'max_ms': longest * 1000,
+                            'alloc_bytes': allocated if self.trace_memory else None}
+                     for name, (calls, seconds, longest, allocated) in self.stats.items()}
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({'time': time.strftime('%Y-%m-%d %H:%M:%S'), 'stages': stats}, f, ensure_ascii=False, indent=2)
+
+
+# Shared by the CLI, the GUI and the modules they use
+TIMER = StageTimer()
@@ -0,0 +1,161 @@
+try:
+    import numpy as np
+except ImportError:  # numpy is optional; plain Python loops are used instead
+    np = None
+
+# Criteria in a tiebreak chain; each one only orders the teams that are still
+# tied on every criterion before it.
+#   total           cumulative total score (after penalties)
+#   kill            cumulative kill score
+#   best_placement  best single-round placement (in-game rank column when
+#                   available, otherwise the rank of the team's round score)
+#   wins            number of rounds finished first
+#   best_round      highest single-round total score
+#   last_round      total score in the most recent round
+#   head_to_head    rounds won against each of the other still-tied teams
+CRITERIA = ('total', 'kill', 'best_placement', 'wins', 'best_round', 'last_round', 'head_to_head')
+DEFAULT_CHAIN = ('total', 'kill')
+
+# Criteria that only need a team's own totals, so one team's key can be
+# recomputed on its own
+PER_TEAM = ('total', 'kill')
+
+
+def parse_chain(text):
+    """'total, kill, head_to_head' -> ('total', 'kill', 'head_to_head'); raises ValueError on unknown names."""
+    chain = tuple(name.strip() for name in text.replace(',', ' ').split())
+    unknown = [name for name in chain if name not in CRITERIA]
+    if unknown:
+        raise ValueError(f"unknown tiebreak criteria: {', '.join(unknown)} (choose from {', '.join(CRITERIA)})")
+    return chain or DEFAULT_CHAIN
+
+
+class TieBreaker:
+    """
+    Composite ranking keys (highest first, as RankingIndex expects) for a
+    chain of criteria. Teams with equal keys are tied and share a rank under
+    competition ranking (1, 2, 2, 4).
+
+    keys() computes every team's key in one pass per criterion, vectorised
+    with numpy when installed; callers keep the result (e.g. in RankingIndex)
+    and only call it again when scores change. When the chain is per_team,
+    key() gives one team's key directly.
+    """
+
+    def __init__(self, chain=DEFAULT_CHAIN, shared_ranks=False):
+        self.chain = parse_chain(' '.join(chain))
+        self.shared_ranks = shared_ranks
+        # Positions in (total, kill) for per-team chains, so key() is one tuple build
+        self._fields = tuple(0 if name == 'total' else 1 for name in self.chain if name in PER_TEAM)
+
+    @property
+    def per_team(self):
+        return all(name in PER_TEAM for name in self.chain)
+
+    def ranks(self, keys):
+        """Rank numbers for keys in ranking order: competition ranks if shared_ranks, else positions."""
+        return competition_ranks(keys) if self.shared_ranks else list(range(1, len(keys) + 1))
+
+    def key(self, total, kill):
+        if self._fields == (0, 1):
+            return (total, kill)
+        pair = (total, kill)
+        return tuple(pair[i] for i in self._fields)
+
+    def keys(self, totals, kills, rounds=None, placements=None):
+        """
+        totals, kills: per team. rounds: rounds x teams single-round totals.
+        placements: rounds x teams in-game placements (NaN or 0 where a team
+        did not play), optional. Returns one key tuple per team.
+        """
+        n = len(totals)
+        if rounds is not None and len(rounds) == 0:
+            rounds = None
+        columns = []
+        for name in self.chain:
+            if name == 'total':
+                columns.append(list(totals))
+            elif name == 'kill':
+                columns.append(list(kills))
+            elif name == 'head_to_head':
+                columns.append(self._head_to_head(columns, rounds, n))
+            elif rounds is None:
+                columns.append([0.0] * n)
+            elif name == 'best_round':
+                columns.append(_reduce(rounds, max))
+            elif name == 'last_round':
+                columns.append([float(v) for v in rounds[-1]])
+            else:
+                places = _placements(rounds, placements)
+                if name == 'best_placement':
+                    # Lower placement is better; missing rounds never count
+                    columns.append([-v if v else float('-inf') for v in _reduce(places, _best_place)])
+                else:
+                    columns.append(_reduce(places, lambda vs: float(sum(1 for v in vs if v == 1))))
+        return list(zip(*columns)) if columns else [()] * n
+
+    @staticmethod
+    def _head_to_head(columns, rounds, n):
+        """For each team, rounds in which it outscored each rival tied with it on the criteria so far."""
+        wins = [0.0] * n
+        if rounds is None:
+            return wins
+        prefix = list(zip(*columns)) if columns else [()] * n
+        groups = {}
+        for i, key in enumerate(prefix):
+            groups.setdefault(key, []).append(i)
+        for members in groups.values():
+            if len(members) < 2:
+                continue
+            if np is not None:
+                sub = np.asarray(rounds, dtype=float)[:, members]
+                counts = (sub[:, :, None] > sub[:, None, :]).sum(axis=(0, 2))
+                for i, count in zip(members, counts.tolist()):
+                    wins[i] = float(count)
+            else:
+                for i in members:
+                    wins[i] = float(sum(1 for row in rounds for j in members if row[i] > row[j]))
+        return wins
+
+
+def competition_ranks(keys):
+    """Ranks for keys already in ranking order: equal keys share a rank, the next one skips (1, 2, 2, 4)."""
+    ranks = []
+    for i, key in enumerate(keys):
+        ranks.append(ranks[-1] if i and key == keys[i - 1] else i + 1)
+    return ranks
+
+
+def _best_place(values):
+    present = [v for v in values if v == v and v > 0]
+    return min(present) if present else 0.0
+
+
+def _reduce(matrix, fn):
+    """fn over each team's column of a rounds x teams matrix."""
+    if np is not None and fn is max:
+        return np.asarray(matrix, dtype=float).max(axis=0).tolist()
+    return [fn(column) for column in zip(*matrix)]
+
+
+def _placements(rounds, placements):
+    """
+    In-game placements where given, otherwise each team's rank by round score
+    (ties share the better rank). A round whose placements are all missing
+    (e.g. an export without the rank column) falls back to the score ranks.
+    """
+    if placements is None or len(placements) != len(rounds):
+        placements = [None] * len(rounds)
+    return [list(given) if given is not None and any(v == v and v > 0 for v in given) else _score_ranks(row)
+            for row, given in zip(rounds, placements)]
+
+
+def _score_ranks(row):
+    if np is not None:
+        m = -np.asarray(row, dtype=float)
+        return (np.searchsorted(np.sort(m), m, side='left') + 1).astype(float).tolist()
+    ordered = sorted(row, reverse=True)
+    first = {}
+    for i, v in enumerate(ordered):
+        first.setdefault(v, i + 1)
+    return [float(first[v]) for v in row]
@@ -1,82 +1,585 @@
+import argparse
+import atexit
 import csv
+import json
 import sys
 import os
 import glob
+import time
+from concurrent.futures import ProcessPoolExecutor
 
-def normalize_name(name):
-    """Normalize whitespace in names."""
-    return ' '.join(name.split())
+import checkpoint
+from column_store import PLACEMENT_COLUMN, TEAM_KILL_COLUMN, ColumnStore
+from name_index import NameIndex, apply_aliases
+from results_watcher import ResultsWatcher
+from ranking import RankingIndex
+from round_reader import KILL_COLUMN, RoundFileError, read_round
+from score_matrix import ScoreMatrix
+from scoreboard_server import ScoreboardServer
+from simulation import default_sims, simulate
+from stage_timer import TIMER
+from tiebreak import TieBreaker, parse_chain
 
+@TIMER.timed('load_round_data')
 def load_round_data(file_path):
     """
     Reads a CSV file and returns a dictionary of team data for that round.
     Returns: { 'TeamName': {'total': float, 'kill': float} }
     """
-    round_data = {}
-    
-    # Try different encodings
-    encodings_to_try = ['utf-8-sig', 'cp949', 'utf-8']
-    
-    for encoding in encodings_to_try:
-        try:
-            with open(file_path, mode='r', encoding=encoding) as csvfile:
-                reader = csv.DictReader(csvfile)
-                if reader.fieldnames:
-                    reader.fieldnames = [name.strip() for name in reader.fieldnames]
-
-                # Check if the header looks correct
-                # We expect at least 'teamName' or similar. 
-                # If the encoding is wrong, the keys might be garbage.
-                # However, strict checking is done below.
-                
-                rows = list(reader) # Read all to ensure encoding doesn't fail mid-file
-                
-                temp_data = {}
-                valid_encoding = False
-                
-                for row in rows:
-                    raw_name = row.get('teamName', '')
-                    if not raw_name:
-                        # Try to see if maybe the header was read wrong?
-                        # But for now, just skip empty
-                        continue
-                        
-                    valid_encoding = True # Found a teamName column at least
-                    
-                    team_name = normalize_name(raw_name)
-                    if not team_name:
-                        continue
-
-                    try:
-                        total = float(row.get('tournament total score', 0))
-                        kill = float(row.get('tournament kill score', 0))
-                    except ValueError:
-                        continue
-
-                    temp_data[team_name] = {'total': total, 'kill': kill}
-                
-                if valid_encoding:
-                    round_data = temp_data
-                    return round_data
-                    
-        except UnicodeDecodeError:
+    try:
+        record = read_round(file_path)
+    except (OSError, RoundFileError) as e:
+        print(f"Error: Could not read {file_path} with supported encodings or file is empty. ({e})")
+        sys.exit(1)
+
+    return {team: {'total': total, 'kill': kill} for team, (total, kill) in record.scores.items()}
+
+@TIMER.timed('accumulate')
+def start_tournament(base_data):
+    """Initializes cumulative scores from the base round."""
+    tournament_stats = {}
+    for team in base_data:
+        tournament_stats[team] = {
+            'team_name': team,
+            'total_score': base_data[team]['total'],
+            'kill_score': base_data[team]['kill'],
+            'round_scores': [base_data[team]['total']]
+        }
+    return tournament_stats
+
+def round_mismatch(tournament_stats, round_data, file_path, index=None):
+    """
+    Returns an error message if the round's team list differs from the base round, else None.
+    With a NameIndex over the base teams, unknown teams come with their closest matches.
+    """
+    valid_teams = set(tournament_stats.keys())
+    round_teams = set(round_data.keys())
+
+    # Check for Mismatches
+    # 1. Are there teams in this round that weren't in the base?
+    new_unknown_teams = round_teams - valid_teams
+    if new_unknown_teams:
+        message = (f"[ERROR] Team name mismatch in {os.path.basename(file_path)}!\n"
+                   f"Found unknown teams: {', '.join(new_unknown_teams)}")
+        if index is not None:
+            for name in new_unknown_teams:
+                suggestions = index.suggest(name, exclude=round_teams)
+                if suggestions:
+                    message += f"\n  {name}: did you mean {', '.join(team for team, _ in suggestions)}?"
+        return message
+
+    # 2. Are there teams missing from this round? (Optional: Warning or Error?)
+    # Usually strictly matching means the set must be identical.
+    missing_teams = valid_teams - round_teams
+    if missing_teams:
+        return (f"[ERROR] Team list mismatch in {os.path.basename(file_path)}!\n"
+                f"Missing teams: {', '.join(missing_teams)}")
+    return None
+
+@TIMER.timed('accumulate')
+def add_round(tournament_stats, round_data, file_path, index=None):
+    """
+    Validates a round against the base teams and accumulates it.
+    Prints the mismatch (with suggestions when given a NameIndex) and returns
+    False if the team lists differ.
+    """
+    error = round_mismatch(tournament_stats, round_data, file_path, index)
+    if error:
+        print("\n" + error)
+        return False
+    accumulate(tournament_stats, round_data)
+    return True
+
+def accumulate(tournament_stats, round_data):
+    """Adds an already validated round to the cumulative scores."""
+    for team in tournament_stats:
+        tournament_stats[team]['total_score'] += round_data[team]['total']
+        tournament_stats[team]['kill_score'] += round_data[team]['kill']
+        tournament_stats[team]['round_scores'].append(round_data[team]['total'])
+
+# Name reconciliation
+# An unknown team name in a later round is usually a typo or a renamed team.
+# Confirmed aliases ({name in the file: base team}) are applied to every
+# later round, optionally kept in a JSON file (--aliases), and when running
+# in a terminal the operator is asked about new names with the closest base
+# teams from a NameIndex as suggestions.
+
+def load_aliases(path):
+    try:
+        with open(path, encoding='utf-8') as f:
+            return dict(json.load(f))
+    except FileNotFoundError:
+        return {}
+    except (OSError, ValueError) as e:
+        print(f"Warning: Could not read aliases from {path} ({e})")
+        return {}
+
+def save_aliases(path, aliases):
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(aliases, f, ensure_ascii=False, indent=2)
+
+def reconcile_round(tournament_stats, round_data, file_path, aliases, index, alias_file=None):
+    """Renames unknown teams through known aliases, asking about new ones on a terminal."""
+    round_data = apply_aliases(round_data, aliases, tournament_stats)
+    if not sys.stdin.isatty():
+        return round_data
+    for name in [n for n in round_data if n not in tournament_stats]:
+        suggestions = index.suggest(name, limit=5, exclude=round_data)
+        if not suggestions:
             continue
-        except Exception as e:
-            # If it's not an encoding error, it might be a file error
-            print(f"Error reading {file_path} with {encoding}: {e}")
+        print(f"\nUnknown team '{name}' in {os.path.basename(file_path)}. Closest registered teams:")
+        for i, (team, score) in enumerate(suggestions, 1):
+            print(f"  {i}) {team} ({score:.0%})")
+        answer = input("Enter a number to treat it as that team, or press Enter to skip: ").strip()
+        if not answer.isdigit() or not 1 <= int(answer) <= len(suggestions):
             continue
-
-    if not round_data:
-        print(f"Error: Could not read {file_path} with supported encodings or file is empty.")
-        sys.exit(1)
-        
+        team = suggestions[int(answer) - 1][0]
+        aliases[name] = team
+        round_data = apply_aliases(round_data, {name: team}, tournament_stats)
+        print(f"'{name}' will be counted as '{team}' from now on.")
+        if alias_file:
+            try:
+                save_aliases(alias_file, aliases)
+            except OSError as e:
+                print(f"Warning: Could not save aliases to {alias_file} ({e})")
     return round_data
 
+@TIMER.timed('rank')
+def rank_teams(tournament_stats, breaker=None):
+    """Teams in ranking order as (rank, stats) pairs; tied teams share a rank if the breaker says so."""
+    breaker = breaker or TieBreaker()
+    names = list(tournament_stats)
+    keys = team_keys(tournament_stats, names, breaker)
+    ranking = RankingIndex(zip(names, keys))
+    if not breaker.shared_ranks:
+        return [(rank, tournament_stats[team]) for rank, team in enumerate(ranking, 1)]
+    order = list(ranking)
+    key_of = dict(zip(names, keys))
+    ranks = breaker.ranks([key_of[team] for team in order])
+    return [(rank, tournament_stats[team]) for rank, team in zip(ranks, order)]
+
+def team_keys(tournament_stats, names, breaker):
+    """Ranking keys for the named teams from the tiebreak chain, one per team."""
+    teams = [tournament_stats[name] for name in names]
+    if breaker.per_team:
+        key = breaker.key
+        return [key(s['total_score'], s['kill_score']) for s in teams]
+    rounds = [list(scores) for scores in zip(*(s['round_scores'] for s in teams))]
+    placements = None
+    if teams and all('placements' in s for s in teams):
+        placements = [list(places) for places in zip(*(s['placements'] for s in teams))]
+    return breaker.keys([s['total_score'] for s in teams], [s['kill_score'] for s in teams], rounds, placements)
+
+def attach_placements(file_paths, tournament_stats, aliases=None):
+    """Adds each team's in-game placement per round ('placements') for placement tiebreaks."""
+    store = ColumnStore(columns=(PLACEMENT_COLUMN,))
+    try:
+        for file_path in file_paths:
+            store.add_round(file_path, aliases)
+    except (OSError, RoundFileError) as e:
+        print(f"Warning: Could not read placements, using round scores instead ({e})")
+        return
+    if not any(PLACEMENT_COLUMN in store.header(i) for i in range(len(store))):
+        return  # no placements in these exports; tiebreaks rank round scores instead
+    for name, s in tournament_stats.items():
+        j = store.ids.get(name)
+        if j is not None:
+            s['placements'] = [column[j] for column in store.columns[PLACEMENT_COLUMN]]
+
+@TIMER.timed('print standings')
+def print_standings(ranked_teams):
+    """Prints the (rank, stats) pairs from rank_teams."""
+    print("\n" + "="*70)
+    print(f"{'Rank':<5} {'Team Name':<30} {'Total Score':<15} {'Kill Score':<10}")
+    print("="*70)
+
+    for rank, team in ranked_teams:
+        print(f"{rank:<5} {team['team_name']:<30} {team['total_score']:<15} {team['kill_score']:<10}")
+    print("="*70 + "\n")
+
+def standings_rows(ranked_teams):
+    """rank_teams output in the scoreboard server's JSON shape."""
+    return [{'rank': rank, 'team': team['team_name'], 'total': team['total_score'],
+             'kill': team['kill_score'], 'penalty': 0.0, 'checkpoint': False}
+            for rank, team in ranked_teams]
+
+@TIMER.timed('rank history')
+def print_rank_history(matrix):
+    """Prints each team's rank after every round, best final rank first."""
+    if matrix.rounds == 0:
+        return
+    history = matrix.rank_history()
+    final = history[-1]
+    movement = matrix.movement()
+    order = sorted(range(len(matrix.teams)), key=lambda i: final[i])
+
+    rounds = ''.join(f"{'R' + str(r + 1):>5}" for r in range(matrix.rounds))
+    print("Rank history")
+    print("="*70)
+    print(f"{'Team Name':<30}{rounds} {'+/-':>5}")
+    print("="*70)
+    for i in order:
+        ranks = ''.join(f"{int(history[r][i]):>5}" for r in range(matrix.rounds))
+        print(f"{matrix.teams[i]:<30}{ranks} {movement[i]:>+5}")
+    print("="*70 + "\n")
+
+def print_round_stats(file_paths, ranked_teams, aliases=None):
+    """Prints placement and kill statistics from the other export columns, in standings order."""
+    store = ColumnStore(columns=(PLACEMENT_COLUMN, TEAM_KILL_COLUMN, KILL_COLUMN))
+    try:
+        for file_path in file_paths:
+            store.add_round(file_path, aliases)
+    except (OSError, RoundFileError) as e:
+        print(f"Error: Could not read round statistics ({e})")
+        return
+    wins = store.count(PLACEMENT_COLUMN, 1)
+    best = store.min(PLACEMENT_COLUMN)
+    mean = store.mean(PLACEMENT_COLUMN)
+    team_kills = store.sum(TEAM_KILL_COLUMN)
+    best_kills = store.max(KILL_COLUMN)
+
+    def fmt(value, spec):
+        return f"{value:{spec}}" if value == value else f"{'-':>{spec.split('.')[0]}}"
+
+    print("Round statistics")
+    print("="*76)
+    print(f"{'Team Name':<30}{'Wins':>6}{'Best':>6}{'Avg Place':>11}{'Team Kills':>12}{'Max Kills':>11}")
+    print("="*76)
+    for _, team in ranked_teams:
+        j = store.ids.get(team['team_name'])
+        if j is None:
+            continue
+        print(f"{team['team_name']:<30}{fmt(wins[j], '6.0f')}{fmt(best[j], '6.0f')}{fmt(mean[j], '11.2f')}"
+              f"{fmt(team_kills[j], '12.0f')}{fmt(best_kills[j], '11.1f')}")
+    print("="*76 + "\n")
+
+@TIMER.timed('print simulation')
+def print_simulation(ranked_teams, matrix, remaining, sims=None, top=3, checkpoint_score=None, slots=1, jobs=1):
+    """Prints Monte Carlo odds of each team's final finish, in standings order."""
+    ranked = [team for _, team in ranked_teams]
+    ids = [matrix.ids[team['team_name']] for team in ranked]
+    round_totals = [[column[i] for i in ids] for column in matrix.totals]
+    round_kills = [[column[i] for i in ids] for column in matrix.kills]
+    cp = None
+    if checkpoint_score is not None:
+        cumulative = matrix.cumulative(ids)[0]
+        crossed = checkpoint.crossing_rounds(cumulative, checkpoint_score)
+        cp = {'score': checkpoint_score, 'slots': slots, 'crossed': crossed,
+              'crossed_total': [None if r is None else cumulative[r][j] for j, r in enumerate(crossed)]}
+    sims = sims or default_sims(len(ranked), remaining)
+    start = time.perf_counter()
+    try:
+        result = simulate([t['total_score'] for t in ranked], [t['kill_score'] for t in ranked],
+                          round_totals, round_kills, remaining, sims, top, cp, processes=jobs)
+    except RuntimeError as e:
+        print(f"Error: {e}")
+        return
+
+    pass_col = f"{'Pass %':>9}" if cp is not None else ''
+    print(f"Simulation: {sims:,} tournaments, {remaining} rounds left ({time.perf_counter() - start:.2f}s)")
+    print("="*76)
+    print(f"{'Team Name':<30}{'Total':>9}{'Avg Finish':>12}{'Win %':>9}{'Top ' + str(top) + ' %':>9}{pass_col}")
+    print("="*76)
+    for j, team in enumerate(ranked):
+        passed = f"{result['checkpoint'][j] * 100:>9.1f}" if cp is not None else ''
+        print(f"{team['team_name']:<30}{team['total_score']:>9g}{result['expected'][j]:>12.2f}"
+              f"{result['first'][j] * 100:>9.1f}{result['top'][j] * 100:>9.1f}{passed}")
+    print("="*76 + "\n")
+
+def print_profile():
+    print("Profile (allocations are net KiB still held after each stage)")
+    print("="*76)
+    for line in TIMER.report():
+        print(line)
+    print("="*76)
+
+def watch_folder(folder, tournament_stats, matrix, show_history=False, server=None, aliases=None, alias_file=None, breaker=None):
+    """Ingests new result files from `folder` as they appear until Ctrl+C."""
+    aliases = {} if aliases is None else aliases
+    state = {'stats': tournament_stats, 'index': NameIndex(tournament_stats or ())}
+
+    def on_round(record):
+        print(f"Processing: {os.path.basename(record.path)}")
+        round_data = {team: {'total': t, 'kill': k} for team, (t, k) in record.scores.items()}
+        if state['stats'] is None:
+            state['stats'] = start_tournament(round_data)
+            state['index'] = NameIndex(state['stats'])
+        else:
+            round_data = reconcile_round(state['stats'], round_data, record.path, aliases, state['index'], alias_file)
+            if not add_round(state['stats'], round_data, record.path, state['index']):
+                print("Skipping this file.")
+                return
+        matrix.add_round({team: (d['total'], d['kill']) for team, d in round_data.items()})
+        # Ranked once per round; the table and the server share it
+        ranked = rank_teams(state['stats'], breaker)
+        print_standings(ranked)
+        if show_history:
+            print_rank_history(matrix)
+        if server is not None:
+            server.publish(standings_rows(ranked))
+
+    def on_error(path, error):
+        print(f"Error: Could not read {path} ({error})")
+
+    print(f"Watching {os.path.abspath(folder)} for new result files (Ctrl+C to stop)...")
+    watcher = ResultsWatcher(folder, on_round, on_error)
+    try:
+        watcher.run()
+    except KeyboardInterrupt:
+        watcher.stop()
+
+# Follow mode
+# A long-running pipe-friendly mode. Round files arrive one at a time, as
+# paths on stdin or as new files in a folder, and each one updates the totals
+# and a RankingIndex in place, so a round costs O(teams) whatever came before.
+# Only rows whose rank or score changed are written (the full table with
+# --full, or on stdin by sending a ":table" line), and a bad round is reported
+# and skipped instead of ending the run.
+
+def follow(source, file_paths=(), full=False, as_json=False, server=None, aliases=None, breaker=None):
+    aliases = aliases or {}
+    breaker = breaker or TieBreaker()
+    state = {'stats': None, 'rounds': 0, 'index': None}
+    ranking = RankingIndex()
+    shown = {}   # team -> (rank, total, kill) as last written
+
+    def write(text):
+        sys.stdout.write(text + "\n")
+        sys.stdout.flush()
+
+    def report(path, message):
+        if as_json:
+            write(json.dumps({'file': os.path.basename(path), 'error': message}, ensure_ascii=False))
+        else:
+            write(f"Skipped {os.path.basename(path)}: {' '.join(line.strip() for line in message.splitlines())}")
+
+    def ranked():
+        teams = list(ranking)
+        return zip(breaker.ranks([ranking.key(team) for team in teams]), teams)
+
+    def rows(changed_only):
+        result = []
+        for rank, team in ranked():
+            s = state['stats'][team]
+            row = (rank, s['total_score'], s['kill_score'])
+            if changed_only and shown.get(team) == row:
+                continue
+            shown[team] = row
+            result.append({'rank': rank, 'team': team, 'total': row[1], 'kill': row[2]})
+        return result
+
+    def emit(path, changed_only):
+        table = rows(changed_only)
+        if as_json:
+            write(json.dumps({'round': state['rounds'], 'file': os.path.basename(path) if path else None,
+                              'full': not changed_only, 'rows': table}, ensure_ascii=False))
+        else:
+            title = f"Round {state['rounds']}: {os.path.basename(path)}" if path else f"After round {state['rounds']}"
+            write(f"{title} ({len(table)} {'rows' if not changed_only else 'changed'})")
+            for row in table:
+                write(f"  {row['rank']:<5} {row['team']:<30} {row['total']:<15} {row['kill']:<10}")
+        if server is not None:
+            stats = state['stats']
+            server.publish([{'rank': rank, 'team': team, 'total': stats[team]['total_score'],
+                             'kill': stats[team]['kill_score'], 'penalty': 0.0, 'checkpoint': False}
+                            for rank, team in ranked()])
+
+    def ingest(path, record=None):
+        if record is None:
+            try:
+                record = read_round(path)
+            except Exception as e:
+                # Any unreadable round is reported the way the watcher reports one; following goes on
+                report(path, f"could not read file ({e})")
+                return
+        round_data = {team: {'total': t, 'kill': k} for team, (t, k) in record.scores.items()}
+        if state['stats'] is None:
+            state['stats'] = start_tournament(round_data)
+            state['index'] = NameIndex(state['stats'])
+        else:
+            round_data = apply_aliases(round_data, aliases, state['stats'])
+            error = round_mismatch(state['stats'], round_data, path, state['index'])
+            if error:
+                report(path, error)
+                return
+            accumulate(state['stats'], round_data)
+        state['rounds'] += 1
+        names = list(state['stats'])
+        for team, key in zip(names, team_keys(state['stats'], names, breaker)):
+            ranking.update(team, key)
+        emit(path, not full)
+
+    for path in file_paths:
+        ingest(path)
+
+    if source == '-':
+        for line in sys.stdin:
+            line = line.strip()
+            if line == ':table':
+                if state['stats'] is not None:
+                    emit(None, False)
+            elif line:
+                ingest(line)
+        return
+
+    watcher = ResultsWatcher(source, lambda record: ingest(record.path, record),
+                             lambda path, error: report(path, f"could not read file ({error})"))
+    for path in sorted(watcher.seen):
+        ingest(path)
+    try:
+        watcher.run()
+    except KeyboardInterrupt:
+        watcher.stop()
+
+# Batch mode
+# Every folder under the root that directly contains CSV files is one tournament
+# (files in name order, the first is the base round). Tournaments run on a
+# process pool and a bad tournament is reported in the summary instead of
+# stopping the run.
+
+def find_tournaments(root):
+    tournaments = []
+    for folder, dirs, files in os.walk(root):
+        dirs.sort()
+        csv_files = sorted(f for f in files if f.lower().endswith('.csv'))
+        if csv_files:
+            name = os.path.relpath(folder, root).replace(os.sep, '/')
+            tournaments.append((name, [os.path.join(folder, f) for f in csv_files]))
+    return tournaments
+
+def run_tournament(job):
+    """Process pool worker: returns standings or the error for one tournament; never raises."""
+    name, file_paths, chain, shared_ranks = job
+    result = {'name': name, 'files': len(file_paths), 'standings': [], 'error': None}
+    file_path = None
+    try:
+        tournament_stats = None
+        for file_path in file_paths:
+            record = read_round(file_path)
+            round_data = {team: {'total': t, 'kill': k} for team, (t, k) in record.scores.items()}
+            if tournament_stats is None:
+                tournament_stats = start_tournament(round_data)
+                continue
+            error = round_mismatch(tournament_stats, round_data, file_path)
+            if error:
+                result['error'] = error
+                return result
+            accumulate(tournament_stats, round_data)
+        file_path = None
+
+        breaker = TieBreaker(chain, shared_ranks)
+        if 'best_placement' in chain or 'wins' in chain:
+            attach_placements(file_paths, tournament_stats)
+        result['standings'] = [
+            {'rank': rank, 'team': t['team_name'], 'total': t['total_score'], 'kill': t['kill_score']}
+            for rank, t in rank_teams(tournament_stats, breaker)
+        ]
+    except (OSError, RoundFileError) as e:
+        result['error'] = f"[ERROR] Could not read {os.path.basename(file_path or name)}: {e}"
+    except Exception as e:
+        # One broken tournament must not take the pool (and the summary) down with it
+        where = f" at {os.path.basename(file_path)}" if file_path else ""
+        result['error'] = f"[ERROR] {type(e).__name__}{where}: {e}"
+    return result
+
+def write_standings(out_dir, result):
+    os.makedirs(out_dir, exist_ok=True)
+    with open(os.path.join(out_dir, 'standings.csv'), 'w', encoding='utf-8-sig', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(['rank', 'teamName', 'tournament total score', 'tournament kill score'])
+        for row in result['standings']:
+            writer.writerow([row['rank'], row['team'], row['total'], row['kill']])
+    with open(os.path.join(out_dir, 'standings.json'), 'w', encoding='utf-8') as f:
+        json.dump(result, f, ensure_ascii=False, indent=2)
+
+def tiebreak_chain(text):
+    try:
+        return parse_chain(text)
+    except ValueError as e:
+        raise argparse.ArgumentTypeError(str(e))
+
+def add_tiebreak_arguments(parser):
+    parser.add_argument('--tiebreak', metavar='CHAIN', type=tiebreak_chain, default=TieBreaker().chain,
+                        help="ranking criteria in order, e.g. 'total,kill,head_to_head' "
+                             "(total, kill, best_placement, wins, best_round, last_round, head_to_head)")
+    parser.add_argument('--shared-ranks', action='store_true', help="tied teams share a rank (1, 2, 2, 4)")
+
+def run_batch(argv):
+    parser = argparse.ArgumentParser(prog="tournament_calculator.py batch",
+                                     description="Calculate every tournament folder under ROOT")
+    parser.add_argument('root', help="folder whose subfolders each hold one tournament's result CSVs")
+    parser.add_argument('-o', '--out', default='standings', help="output folder (default: ./standings)")
+    parser.add_argument('-j', '--jobs', type=int, default=None, help="worker processes (default: CPU count)")
+    add_tiebreak_arguments(parser)
+    args = parser.parse_args(argv)
+
+    tournaments = [(name, files, args.tiebreak, args.shared_ranks) for name, files in find_tournaments(args.root)]
+    if not tournaments:
+        print(f"No result CSV files found under {args.root}")
+        return 1
+
+    start = time.perf_counter()
+    summary = []
+    with ProcessPoolExecutor(max_workers=args.jobs) as pool:
+        chunksize = max(1, len(tournaments) // ((args.jobs or os.cpu_count() or 1) * 4))
+        for result in pool.map(run_tournament, tournaments, chunksize=chunksize):
+            if result['error'] is None:
+                write_standings(os.path.join(args.out, result['name']), result)
+            leader = result['standings'][0] if result['standings'] else None
+            summary.append({
+                'name': result['name'],
+                'files': result['files'],
+                'teams': len(result['standings']),
+                'leader': leader['team'] if leader else '',
+                'leader_total': leader['total'] if leader else '',
+                'error': result['error'] or '',
+            })
+
+    os.makedirs(args.out, exist_ok=True)
+    with open(os.path.join(args.out, 'summary.csv'), 'w', encoding='utf-8-sig', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=['name', 'files', 'teams', 'leader', 'leader_total', 'error'])
+        writer.writeheader()
+        writer.writerows(summary)
+    with open(os.path.join(args.out, 'summary.json'), 'w', encoding='utf-8') as f:
+        json.dump(summary, f, ensure_ascii=False, indent=2)
+
+    failed = [row for row in summary if row['error']]
+    print(f"{len(summary)} tournaments in {time.perf_counter() - start:.2f}s, {len(failed)} failed -> {os.path.abspath(args.out)}")
+    for row in failed:
+        print(f"\n{row['name']}:\n{row['error']}")
+    return 1 if failed else 0
+
 def main():
+    if len(sys.argv) > 1 and sys.argv[1] == 'batch':
+        sys.exit(run_batch(sys.argv[2:]))
+
+    parser = argparse.ArgumentParser(description="ER tournament score calculator")
+    parser.add_argument('files', nargs='*', help="result CSV files; the first one is the base round")
+    parser.add_argument('-w', '--watch', metavar='FOLDER', help="keep running and ingest new result files from FOLDER")
+    parser.add_argument('--history', action='store_true', help="also print every team's rank after each round")
+    parser.add_argument('--stats', action='store_true', help="also print placement and kill statistics per team")
+    add_tiebreak_arguments(parser)
+    parser.add_argument('-f', '--follow', metavar='SOURCE', help="keep running and update standings per round from result paths on stdin ('-') or files in folder SOURCE")
+    parser.add_argument('--full', action='store_true', help="with --follow, write the full table after every round instead of only changed rows")
+    parser.add_argument('--json', action='store_true', help="with --follow, write one JSON object per line")
+    parser.add_argument('--aliases', metavar='FILE', help="JSON file of confirmed team name aliases, read at start and updated when new ones are confirmed")
+    parser.add_argument('--serve', metavar='PORT', type=int, help="serve live standings and an HTML overlay on http://127.0.0.1:PORT/")
+    parser.add_argument('--simulate', metavar='SIMS', type=int, nargs='?', const=0, help="also print each team's odds of winning, finishing top N and passing the checkpoint, from SIMS simulated endings (default: up to 200000); needs numpy")
+    parser.add_argument('--remaining', metavar='N', type=int, default=3, help="with --simulate, rounds still to play (default: 3)")
+    parser.add_argument('--top', metavar='N', type=int, default=3, help="with --simulate, the top-N finish to report (default: 3)")
+    parser.add_argument('--checkpoint', metavar='SCORE', type=float, help="with --simulate, also report the odds of being among the first --slots teams to reach SCORE")
+    parser.add_argument('--slots', metavar='N', type=int, default=1, help="with --checkpoint, teams that pass it (default: 1)")
+    parser.add_argument('--jobs', metavar='N', type=int, default=1, help="with --simulate, split the simulations across N processes (default: 1)")
+    parser.add_argument('--profile', action='store_true', help="print a per-stage timing and allocation breakdown on exit")
+    args = parser.parse_args()
+
+    if args.profile:
+        TIMER.enable(memory=True)
+        atexit.register(print_profile)
+
     # Expand globs (wildcards) for Windows command line compatibility
-    raw_args = sys.argv[1:]
     file_paths = []
-    for arg in raw_args:
+    for arg in args.files:
         expanded = glob.glob(arg)
         if expanded:
             file_paths.extend(expanded)
@@ -84,73 +587,77 @@ def main():
             # If it doesn't match a glob, assume it's a specific filename that might not exist yet or is just a name
             file_paths.append(arg)
 
-    if not file_paths:
+    if not file_paths and not args.watch and not args.follow:
         print("사용법: 파일을 드래그하거나, 폴더에 .csv 파일이 있어야 합니다.")
         # Don't exit error immediately, just print message so pause works
         return
 
-    # 1. Establish Base Teams from the first file
-    base_file = file_paths[0]
-    print(f"Reading base file (Round 1): {os.path.basename(base_file)}")
-    base_data = load_round_data(base_file)
-    
-    valid_teams = set(base_data.keys())
-    
-    # Initialize cumulative scores
-    tournament_stats = {}
-    for team in valid_teams:
-        tournament_stats[team] = {
-            'team_name': team,
-            'total_score': base_data[team]['total'],
-            'kill_score': base_data[team]['kill']
-        }
-
-    # 2. Process subsequent files
-    for file_path in file_paths[1:]:
-        print(f"Processing: {os.path.basename(file_path)}")
-        round_data = load_round_data(file_path)
-        
-        round_teams = set(round_data.keys())
-        
-        # Check for Mismatches
-        # 1. Are there teams in this round that weren't in the base?
-        new_unknown_teams = round_teams - valid_teams
-        if new_unknown_teams:
-            print(f"\n[ERROR] Team name mismatch in {os.path.basename(file_path)}!")
-            print(f"Found unknown teams: {', '.join(new_unknown_teams)}")
-            print("Aborting calculation to prevent data corruption.")
-            sys.exit(1)
-            
-        # 2. Are there teams missing from this round? (Optional: Warning or Error?)
-        # Usually strictly matching means the set must be identical.
-        missing_teams = valid_teams - round_teams
-        if missing_teams:
-            print(f"\n[ERROR] Team list mismatch in {os.path.basename(file_path)}!")
-            print(f"Missing teams: {', '.join(missing_teams)}")
-            print("Aborting calculation.")
+    server = None
+    if args.serve:
+        server = ScoreboardServer(port=args.serve)
+        try:
+            server.start()
+        except OSError as e:
+            print(f"Error: {e}")
             sys.exit(1)
+        print(f"Serving standings on http://{server.host}:{server.port}/", file=sys.stderr if args.follow else sys.stdout)
 
-        # Accumulate Scores
-        for team in valid_teams:
-            tournament_stats[team]['total_score'] += round_data[team]['total']
-            tournament_stats[team]['kill_score'] += round_data[team]['kill']
+    aliases = load_aliases(args.aliases) if args.aliases else {}
+    breaker = TieBreaker(args.tiebreak, args.shared_ranks)
 
-    # 3. Sort and Display Ranking
-    ranked_teams = sorted(
-        tournament_stats.values(),
-        key=lambda x: (x['total_score'], x['kill_score']),
-        reverse=True
-    )
+    if args.follow:
+        try:
+            follow(args.follow, file_paths, args.full, args.json, server, aliases, breaker)
+        except BrokenPipeError:
+            # The reading end of the pipe went away; silence the final flush too
+            os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        return
 
-    print("\n" + "="*70)
-    print(f"{'Rank':<5} {'Team Name':<30} {'Total Score':<15} {'Kill Score':<10}")
-    print("="*70)
+    tournament_stats = None
+    matrix = ScoreMatrix()
+    if file_paths:
+        # 1. Establish Base Teams from the first file
+        base_file = file_paths[0]
+        print(f"Reading base file (Round 1): {os.path.basename(base_file)}")
+        base_data = load_round_data(base_file)
+        tournament_stats = start_tournament(base_data)
+        matrix.add_round({team: (d['total'], d['kill']) for team, d in base_data.items()})
+        index = NameIndex(tournament_stats)
 
-    current_rank = 1
-    for team in ranked_teams:
-        print(f"{current_rank:<5} {team['team_name']:<30} {team['total_score']:<15} {team['kill_score']:<10}")
-        current_rank += 1
-    print("="*70 + "\n")
+        # 2. Process subsequent files
+        for file_path in file_paths[1:]:
+            print(f"Processing: {os.path.basename(file_path)}")
+            round_data = load_round_data(file_path)
+            round_data = reconcile_round(tournament_stats, round_data, file_path, aliases, index, args.aliases)
+            if not add_round(tournament_stats, round_data, file_path, index):
+                print("Aborting calculation to prevent data corruption.")
+                sys.exit(1)
+            matrix.add_round({team: (d['total'], d['kill']) for team, d in round_data.items()})
+
+        # 3. Sort and Display Ranking
+        if not args.watch and ('best_placement' in breaker.chain or 'wins' in breaker.chain):
+            attach_placements(file_paths, tournament_stats, aliases)
+        ranked = rank_teams(tournament_stats, breaker)
+        print_standings(ranked)
+        if args.history:
+            print_rank_history(matrix)
+        if args.stats:
+            print_round_stats(file_paths, ranked, aliases)
+        if args.simulate is not None:
+            print_simulation(ranked, matrix, args.remaining, args.simulate, args.top,
+                             args.checkpoint, args.slots, args.jobs)
+        if server is not None:
+            server.publish(standings_rows(ranked))
+
+    if args.watch:
+        watch_folder(args.watch, tournament_stats, matrix, args.history, server, aliases, args.aliases, breaker)
+    elif server is not None:
+        print("Serving final standings (Ctrl+C to stop)...")
+        try:
+            while True:
+                time.sleep(1)
+        except KeyboardInterrupt:
+            server.stop()
 
 if __name__ == "__main__":
     main()
@@ -1,8 +1,30 @@
 import tkinter as tk
 from tkinter import ttk, messagebox, filedialog
-import csv
+import bisect
 import glob
 import os
+import queue
+from concurrent.futures import ThreadPoolExecutor
+
+import checkpoint
+from name_index import NameIndex, apply_aliases
+from results_watcher import ResultsWatcher
+from scoreboard_server import ScoreboardServer
+from parse_cache import ParseCache
+from round_reader import RoundFileError, normalize_name
+from ranking import RankingIndex
+from score_matrix import ScoreMatrix
+from session_journal import SessionJournal
+from simulation import default_sims, simulate
+from stage_timer import TIMER
+from tiebreak import CRITERIA, DEFAULT_CHAIN, TieBreaker, competition_ranks, parse_chain
+
+SESSION_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".er_session")
+CACHE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".er_cache.sqlite3")
+SETTINGS = ("checkpoint_mode", "checkpoint_score", "remaining_rounds", "round_max_score", "checkpoint_slots",
+            "tiebreak", "shared_ranks")
+NAN = float('nan')
+CHECKPOINT_STATUS = {checkpoint.CLINCHED: "통과", checkpoint.ELIMINATED: "탈락", checkpoint.ALIVE: "경합"}
 
 # Custom Rounded Button (Design retained as requested previously)
 class RoundedButton(tk.Canvas):
@@ -37,11 +59,169 @@ class RoundedButton(tk.Canvas):
     def _on_leave(self, event):
         self.itemconfig(self.rect_id, fill=self.bg_color, outline=self.bg_color)
 
+class StandingsTable:
+    """
+    Keeps a Treeview in sync with a ranked row list by applying only the differences:
+    rows are keyed by team, moved only when their position changes and edited only
+    when a cell changes. Large fields are virtualised - only the visible window of
+    rows exists in the Treeview and the scrollbar is driven by the offset.
+    """
+    VIRTUAL_THRESHOLD = 300
+
+    def __init__(self, tree, scrollbar=None, rowheight=35):
+        self.tree = tree
+        self.scrollbar = scrollbar
+        self.rowheight = rowheight
+        self.rows = []      # full ranked list of (team, values, tags)
+        self.shown = []     # teams currently in the tree, top to bottom
+        self.cells = {}     # team -> (values, tags) as displayed
+        self.iids = {}      # team -> Treeview iid
+        self.teams = {}     # Treeview iid -> team
+        self.next_iid = 0
+        self.offset = 0
+        self.page = 20
+
+    @property
+    def virtual(self):
+        return len(self.rows) > self.VIRTUAL_THRESHOLD
+
+    def team_of(self, iid):
+        return self.teams.get(iid)
+
+    def update(self, rows):
+        self.rows = rows
+        self._render()
+
+    def resize(self, height):
+        page = max(1, height // self.rowheight)
+        if page != self.page:
+            self.page = page
+            if self.virtual: self._render()
+
+    def _render(self):
+        if self.virtual:
+            self.offset = max(0, min(self.offset, len(self.rows) - self.page))
+            target = self.rows[self.offset:self.offset + self.page + 1]
+        else:
+            self.offset = 0
+            target = self.rows[0:len(self.rows)]
+
+        keep = set(row[0] for row in target)
+        for team in self.shown:
+            if team not in keep:
+                iid = self.iids.pop(team)
+                del self.teams[iid]
+                del self.cells[team]
+                self.tree.delete(iid)
+        shown = [team for team in self.shown if team in keep]
+
+        # Rows on the longest run that is already in target order stay put
+        stable = self._stable(shown, {row[0]: i for i, row in enumerate(target)})
+
+        prev = None
+        for team, values, tags in target:
+            if team not in stable:
+                if team in self.iids:
+                    shown.remove(team)
+                idx = shown.index(prev) + 1 if prev is not None else 0
+                if team in self.iids:
+                    self.tree.move(self.iids[team], "", idx)
+                else:
+                    iid = f"t{self.next_iid}"
+                    self.next_iid += 1
+                    self.iids[team] = iid
+                    self.teams[iid] = team
+                    self.tree.insert("", idx, iid=iid, values=values, tags=tags)
+                    self.cells[team] = (values, tags)
+                shown.insert(idx, team)
+            if self.cells[team] != (values, tags):
+                self.tree.item(self.iids[team], values=values, tags=tags)
+                self.cells[team] = (values, tags)
+            prev = team
+
+        self.shown = shown
+        if self.virtual and self.scrollbar is not None:
+            n = len(self.rows)
+            self.scrollbar.set(self.offset / n, min(1.0, (self.offset + self.page) / n))
+
+    @staticmethod
+    def _stable(shown, position):
+        # Longest increasing subsequence of target positions (patience sorting)
+        tails, tail_idx, parent = [], [], [None] * len(shown)
+        for i, team in enumerate(shown):
+            p = position[team]
+            j = bisect.bisect_left(tails, p)
+            parent[i] = tail_idx[j - 1] if j else None
+            if j == len(tails):
+                tails.append(p)
+                tail_idx.append(i)
+            else:
+                tails[j] = p
+                tail_idx[j] = i
+        stable = set()
+        i = tail_idx[-1] if tail_idx else None
+        while i is not None:
+            stable.add(shown[i])
+            i = parent[i]
+        return stable
+
+    # Scrolling: forwarded to the Treeview unless the table is virtualised
+
+    def yview(self, *args):
+        if not self.virtual:
+            return self.tree.yview(*args)
+        if args[0] == "moveto":
+            self.offset = int(float(args[1]) * len(self.rows))
+        elif args[0] == "scroll":
+            step = self.page if args[2] == "pages" else 1
+            self.offset += int(args[1]) * step
+        self._render()
+
+    def on_tree_scroll(self, first, last):
+        if not self.virtual and self.scrollbar is not None:
+            self.scrollbar.set(first, last)
+
+    def on_wheel(self, event):
+        if not self.virtual: return
+        self.yview("scroll", -1 if event.delta > 0 else 1, "units")
+        return "break"
+
+class RankedRows:
+    """
+    Row sequence for StandingsTable backed by a RankingIndex. Rows are only
+    built for the slice the table asks for, so a virtualised table formats
+    just the visible window. With shared_ranks, tied teams show the same rank.
+    """
+    def __init__(self, ranking, make_row, shared_ranks=False):
+        self.ranking = ranking
+        self.make_row = make_row
+        self.shared_ranks = shared_ranks
+
+    def __len__(self):
+        return len(self.ranking)
+
+    def __getitem__(self, index):
+        start, stop, _ = index.indices(len(self.ranking))
+        teams = self.ranking.slice(start, stop)
+        if not self.shared_ranks:
+            return [self.make_row(start + i + 1, team) for i, team in enumerate(teams)]
+        rows = []
+        previous = None
+        for i, team in enumerate(teams):
+            key = self.ranking.key(team)
+            if i == 0:
+                rank = self.ranking.rank(team, ties=True)
+            elif key != previous:
+                rank = start + i + 1
+            previous = key
+            rows.append(self.make_row(rank, team))
+        return rows
+
 class TournamentApp:
     def __init__(self, root):
         self.root = root
         self.root.title("ER Tournament Calculator")
-        self.root.geometry("1000x750")
+        self.root.geometry("1280x750")
         
         # Color Theme
         self.colors = {
@@ -57,15 +237,42 @@ class TournamentApp:
 
         self.root.configure(bg=self.colors["bg_main"])
         self.teams_data = {}  
+        self.ranking = RankingIndex()
         self.penalties = {}   
         self.valid_teams = set()
         self.loaded_files = [] 
+        self.round_deltas = []
+        self.round_sources = []
+        self.scores = ScoreMatrix()
         self.history = []      
+        self.aliases = {}
+        self.name_index = None
+        self.indexed_teams = None
         self.checkpoint_mode = False
         self.checkpoint_score = 50.0
+        self.remaining_rounds = 3
+        self.round_max_score = 30.0
+        self.checkpoint_slots = 1
+        self.checkpoint_info = {}
+        self.tiebreak = list(DEFAULT_CHAIN)
+        self.shared_ranks = False
+        self.breaker = TieBreaker(self.tiebreak)
+        self.keys_dirty = False
+
+        self.events = queue.Queue()
+        self.watcher = None
+        self.pool = ThreadPoolExecutor(max_workers=min(4, os.cpu_count() or 1))
+        self.cache = ParseCache(CACHE_PATH)
+        self.loading = None
+        self.server = None
+
+        self.journal = SessionJournal(SESSION_DIR)
+        self.restoring = False
 
         self.setup_styles()
         self.create_widgets()
+        self.poll_events()
+        self.root.after(0, self.offer_restore)
 
     def setup_styles(self):
         style = ttk.Style()
@@ -105,28 +312,51 @@ class TournamentApp:
 
         add_btn(btn_box, "설정", self.open_settings, self.colors["btn_dark"], self.colors["btn_dark_h"], 80)
         add_btn(btn_box, "파일 추가", self.upload_file, self.colors["btn_green"], self.colors["btn_green_h"])
+        add_btn(btn_box, "폴더 추가", self.upload_folder, self.colors["btn_green"], self.colors["btn_green_h"])
         add_btn(btn_box, "파일 취소", self.undo_last_file, self.colors["btn_orange"], self.colors["btn_orange_h"])
+        add_btn(btn_box, "자동 감지", self.toggle_watch, self.colors["btn_grey"], self.colors["btn_grey_h"])
+        add_btn(btn_box, "라운드 관리", self.open_rounds, self.colors["btn_blue"], self.colors["btn_blue_h"])
+        add_btn(btn_box, "순위 변동", self.open_history, self.colors["btn_blue"], self.colors["btn_blue_h"])
+        add_btn(btn_box, "확률 예측", self.open_simulation, self.colors["btn_blue"], self.colors["btn_blue_h"])
+        add_btn(btn_box, "방송 서버", self.toggle_server, self.colors["btn_grey"], self.colors["btn_grey_h"])
 
         # Status
-        self.lbl_status = tk.Label(self.root, text="준비 완료", bg=self.colors["bg_main"], fg="#656D78", font=("Malgun Gothic", 9))
-        self.lbl_status.pack(fill=tk.X, padx=30, pady=(0, 5))
+        status_frame = tk.Frame(self.root, bg=self.colors["bg_main"])
+        status_frame.pack(fill=tk.X, padx=30, pady=(0, 5))
+        self.lbl_status = tk.Label(status_frame, text="준비 완료", bg=self.colors["bg_main"], fg="#656D78", font=("Malgun Gothic", 9))
+        self.lbl_status.pack(side=tk.LEFT, fill=tk.X, expand=True)
+        self.btn_cancel = tk.Label(status_frame, text="불러오기 중지", bg=self.colors["bg_main"], fg=self.colors["btn_red"], font=("Malgun Gothic", 9, "underline"), cursor="hand2")
+        self.btn_cancel.bind("<Button-1>", lambda e: self.cancel_loading())
+        self.btn_dump = tk.Label(status_frame, text="통계 저장", bg=self.colors["bg_main"], fg=self.colors["btn_blue_h"], font=("Malgun Gothic", 9, "underline"), cursor="hand2")
+        self.btn_dump.bind("<Button-1>", lambda e: self.dump_timing())
+        self.btn_timing = tk.Label(status_frame, text="성능 측정", bg=self.colors["bg_main"], fg=self.colors["btn_grey_h"], font=("Malgun Gothic", 9, "underline"), cursor="hand2")
+        self.btn_timing.bind("<Button-1>", lambda e: self.toggle_timing())
+        self.btn_timing.pack(side=tk.RIGHT, padx=(10, 0))
+        self.lbl_timing = tk.Label(status_frame, text="", bg=self.colors["bg_main"], fg="#656D78", font=("Malgun Gothic", 9))
+        self.shown_timing = None
 
         # Main Table (Standard Treeview)
         table_frame = tk.Frame(self.root, bg="white", padx=10, pady=10)
         table_frame.pack(fill=tk.BOTH, expand=True, padx=30, pady=10)
 
-        cols = ("rank", "team", "total", "kill", "penalty")
-        self.tree = ttk.Treeview(table_frame, columns=cols, show="headings")
+        cols = ("rank", "team", "total", "kill", "penalty", "cp_status", "cp_need", "cp_secure")
+        self.tree = ttk.Treeview(table_frame, columns=cols, show="headings", displaycolumns=cols[:5])
         
-        headers = {"rank": "순위", "team": "팀 이름", "total": "종합 점수", "kill": "킬 점수", "penalty": "패널티"}
-        widths = {"rank": 60, "team": 300, "total": 120, "kill": 120, "penalty": 100}
+        headers = {"rank": "순위", "team": "팀 이름", "total": "종합 점수", "kill": "킬 점수", "penalty": "패널티",
+                   "cp_status": "체크포인트", "cp_need": "필요 점수", "cp_secure": "확정 점수"}
+        widths = {"rank": 60, "team": 300, "total": 120, "kill": 120, "penalty": 100,
+                  "cp_status": 100, "cp_need": 100, "cp_secure": 100}
 
         for col, text in headers.items():
             self.tree.heading(col, text=text)
             self.tree.column(col, width=widths[col], anchor="center" if col != "team" else "w")
 
-        scrollbar = ttk.Scrollbar(table_frame, orient=tk.VERTICAL, command=self.tree.yview)
-        self.tree.configure(yscroll=scrollbar.set)
+        scrollbar = ttk.Scrollbar(table_frame, orient=tk.VERTICAL)
+        self.table = StandingsTable(self.tree, scrollbar)
+        scrollbar.configure(command=self.table.yview)
+        self.tree.configure(yscroll=self.table.on_tree_scroll)
+        self.tree.bind("<Configure>", lambda e: self.table.resize(e.height))
+        self.tree.bind("<MouseWheel>", self.table.on_wheel)
         
         self.tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
         scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
@@ -152,131 +382,630 @@ class TournamentApp:
         btn_reset.pack(side=tk.RIGHT)
 
     def normalize_name(self, name):
-        return ' '.join(name.split())
+        return normalize_name(name)
 
     def upload_file(self):
-        f = filedialog.askopenfilename(title="파일 선택", filetypes=[("CSV files", "*.csv")])
-        if not f: return
-        path = os.path.abspath(f)
-        if path in self.loaded_files:
+        files = filedialog.askopenfilenames(title="파일 선택", filetypes=[("CSV files", "*.csv")])
+        if not files: return
+        self.load_files(sorted(os.path.abspath(f) for f in files))
+
+    def upload_folder(self):
+        folder = filedialog.askdirectory(title="폴더 선택")
+        if not folder: return
+        self.load_files(sorted(os.path.abspath(f) for f in glob.glob(os.path.join(folder, "*.csv"))))
+
+    # Background loading
+    # Files are read on the worker pool; each finished read is posted to
+    # self.events and rounds are applied on the Tk thread strictly in the
+    # order the paths were given, whatever order the reads complete in.
+
+    def load_files(self, paths):
+        if self.loading is not None:
+            messagebox.showinfo("알림", "파일을 불러오는 중입니다.")
+            return
+        new_paths = []
+        for path in paths:
+            if path not in self.loaded_files and path not in new_paths:
+                new_paths.append(path)
+        if not new_paths:
             messagebox.showinfo("알림", "이미 추가된 파일입니다.")
             return
-        try:
-            self.process_file(path, is_base=(len(self.valid_teams)==0))
-            self.loaded_files.append(path)
+
+        batch = {'paths': new_paths, 'results': {}, 'next': 0, 'futures': [], 'duplicates': 0}
+        self.loading = batch
+        for i, path in enumerate(new_paths):
+            future = self.pool.submit(self.cache.read_round, path)
+            future.add_done_callback(lambda f, i=i: self.events.put(('loaded', (batch, i, f))))
+            batch['futures'].append(future)
+        self.lbl_status.config(text=f"불러오는 중... 0/{len(new_paths)}")
+        self.btn_cancel.pack(side=tk.RIGHT)
+
+    def cancel_loading(self):
+        batch = self.loading
+        if batch is None: return
+        self.finish_loading(f"불러오기 중지됨 ({batch['next']}/{len(batch['paths'])} 적용)")
+
+    def finish_loading(self, status):
+        for future in self.loading['futures']:
+            future.cancel()
+        self.loading = None
+        self.btn_cancel.pack_forget()
+        self.lbl_status.config(text=status)
+
+    @TIMER.timed('apply loaded files')
+    def on_file_loaded(self, batch, index, future):
+        if batch is not self.loading or future.cancelled(): return
+        batch['results'][index] = future
+        paths = batch['paths']
+        applied = batch['next']
+        error = None
+        while batch['next'] in batch['results']:
+            i = batch['next']
+            try:
+                record = batch['results'].pop(i).result()
+            except RoundFileError as e:
+                error = f"{os.path.basename(paths[i])}\n\n{e}\n(CSV 인코딩 또는 헤더를 확인해주세요)"
+                break
+            except Exception as e:
+                error = f"{os.path.basename(paths[i])}\n\n파일을 읽을 수 없습니다.\n({type(e).__name__}: {e})"
+                break
+            if self.is_duplicate(record):
+                batch['duplicates'] += 1
+                batch['next'] += 1
+                continue
+            try:
+                delta = self.check_round(self.reconcile(record.scores, paths[i]), is_base=(len(self.valid_teams)==0))
+            except ValueError as e:
+                error = f"{os.path.basename(paths[i])}\n\n{e}"
+                break
+            self.add_round(paths[i], delta, self.round_source(record, delta))
+            batch['next'] += 1
+
+        if batch['next'] > applied:
             self.refresh_table()
-            self.lbl_status.config(text=f"추가됨: {os.path.basename(path)}")
-        except Exception as e:
-            messagebox.showerror("오류", str(e))
+        if error is not None:
+            self.finish_loading(f"추가 실패: {os.path.basename(paths[batch['next']])}")
+            messagebox.showerror("오류", error)
+        elif batch['next'] == len(paths):
+            added = len(paths) - batch['duplicates']
+            if len(paths) == 1 and added == 0:
+                self.finish_loading("준비 완료")
+                messagebox.showinfo("알림", "이미 추가된 파일입니다.\n(같은 내용의 파일이 이미 있습니다)")
+            elif len(paths) == 1:
+                self.finish_loading(f"추가됨: {os.path.basename(paths[0])}")
+            elif batch['duplicates']:
+                self.finish_loading(f"{added}개 파일 추가됨 (중복 {batch['duplicates']}개 제외)")
+            else:
+                self.finish_loading(f"{len(paths)}개 파일 추가됨")
+        else:
+            self.lbl_status.config(text=f"불러오는 중... {batch['next']}/{len(paths)}")
 
+    @TIMER.timed('undo last file')
     def undo_last_file(self):
         if self.loaded_files:
-            removed = self.loaded_files.pop()
-            self.recalculate_all()
+            removed = self.remove_round(len(self.loaded_files) - 1)
             self.refresh_table()
             self.lbl_status.config(text=f"취소됨: {os.path.basename(removed)}")
         else:
             messagebox.showinfo("알림", "취소할 파일이 없습니다.")
 
-    def recalculate_all(self):
-        self.teams_data = {}
-        self.valid_teams = set()
-        for i, f in enumerate(self.loaded_files):
-            self.process_file(f, is_base=(i==0))
+    # Round deltas
+    # Every loaded file is kept as an immutable {team: (total, kill)} delta in
+    # round_deltas (parallel to loaded_files). teams_data holds the running sum
+    # plus the number of rounds each team appears in, so adding, removing or
+    # reordering a round costs O(teams) and never touches the disk.
 
-    def process_file(self, path, is_base=False):
-        for enc in ['utf-8-sig', 'cp949']:
-            try:
-                with open(path, 'r', encoding=enc) as csvfile:
-                    reader = csv.DictReader(csvfile)
-                    if reader.fieldnames:
-                        reader.fieldnames = [n.strip() for n in reader.fieldnames]
-                    if 'teamName' not in reader.fieldnames: continue
-                    rows = list(reader)
-                    if not rows: continue
-                    
-                    file_scores = {}
-                    has_teams = False
-
-                    for row in rows:
-                        name = self.normalize_name(row.get('teamName', ''))
-                        if not name: continue
-                        has_teams = True
-                        
-                        if is_base: 
-                            self.valid_teams.add(name)
-                        elif name not in self.valid_teams:
-                            raise ValueError(f"등록되지 않은 팀 발견: {name}\n\n이 팀은 첫 번째 파일(1라운드)에 존재하지 않습니다.")
-
-                        try:
-                            t = float(row.get('tournament total score', '0').strip() or 0)
-                            k = float(row.get('tournament kill score', '0').strip() or 0)
-                            file_scores[name] = (t, k)
-                        except:
-                            continue
-
-                    if not has_teams: continue
-
-                    for name, (t, k) in file_scores.items():
-                        if name not in self.teams_data: 
-                            self.teams_data[name] = {'total':0.0, 'kill':0.0}
-                        self.teams_data[name]['total'] += t
-                        self.teams_data[name]['kill'] += k
-                    return 
-            except ValueError as ve:
-                raise ve
-            except:
-                continue
-        
-        raise ValueError("파일을 읽을 수 없거나 'teamName' 열을 찾을 수 없습니다.\n(CSV 인코딩 또는 헤더를 확인해주세요)")
+    @TIMER.timed('add_round')
+    def add_round(self, path, delta, source=None):
+        """
+        `source` is the file's {'digest', 'stat'} so a restored session can skip
+        re-parsing it, plus the round's in-game 'placements' for tiebreaks.
+        """
+        source = source or {'digest': None, 'stat': None, 'placements': {}}
+        self.loaded_files.append(path)
+        self.round_deltas.append(delta)
+        self.round_sources.append(source)
+        self.scores.add_round(delta)
+        self._apply_delta(delta, 1)
+        self.log({'type': 'add', 'path': path, 'digest': source['digest'], 'stat': source['stat'], 'scores': delta,
+                  'placements': source['placements']})
+
+    @TIMER.timed('remove round')
+    def remove_round(self, index):
+        """Drops one round and returns its path. Removing round 1 promotes the next round to base."""
+        delta = self.round_deltas[index]
+        if index in (0, -len(self.round_deltas)) and len(self.round_deltas) > 1:
+            self._check_base(self.round_deltas[1], exclude=delta)
+        self._apply_delta(delta, -1)
+        del self.round_deltas[index]
+        del self.round_sources[index]
+        self.scores.remove_round(index)
+        path = self.loaded_files.pop(index)
+        self.valid_teams = set(self.round_deltas[0]) if self.round_deltas else set()
+        self.log({'type': 'remove', 'index': index})
+        return path
+
+    @TIMER.timed('move round')
+    def move_round(self, src, dst):
+        """Moves a round to a new position. Totals are unchanged; only the base round can change."""
+        if src == dst: return
+        order = list(range(len(self.round_deltas)))
+        order.insert(dst, order.pop(src))
+        new_base = self.round_deltas[order[0]]
+        if order[0] != 0:
+            self._check_base(new_base)
+        self.round_deltas = [self.round_deltas[i] for i in order]
+        self.round_sources = [self.round_sources[i] for i in order]
+        self.scores.move_round(src, dst)
+        self.keys_dirty = self.keys_dirty or not self.breaker.per_team
+        self.loaded_files = [self.loaded_files[i] for i in order]
+        self.valid_teams = set(new_base)
+        self.log({'type': 'move', 'src': src, 'dst': dst})
+
+    def round_source(self, record, delta):
+        """A round's source entry; placements follow the same alias renames as its scores."""
+        placements = {}
+        for name, place in record.placements.items():
+            placements[name if name in delta else self.aliases.get(name, name)] = place
+        return {'digest': record.digest, 'stat': record.stat, 'placements': placements}
+
+    def _check_base(self, base, exclude=None):
+        # teams_data holds every team that appears in at least one round
+        for name, d in self.teams_data.items():
+            if name in base: continue
+            if exclude is not None and name in exclude and d['rounds'] == 1: continue
+            raise ValueError(f"등록되지 않은 팀 발견: {name}\n\n새 1라운드 파일에 존재하지 않는 팀이 있어 변경할 수 없습니다.")
+
+    def _apply_delta(self, delta, sign):
+        for name, (t, k) in delta.items():
+            d = self.teams_data.get(name)
+            if d is None:
+                d = self.teams_data[name] = {'total':0.0, 'kill':0.0, 'rounds':0}
+            d['total'] += sign * t
+            d['kill'] += sign * k
+            d['rounds'] += sign
+            if d['rounds'] == 0:
+                del self.teams_data[name]
+            self._rerank(name)
+
+    # Ranking keys
+    # Keys come from the tiebreak chain. Chains of only total/kill update one
+    # team at a time; chains that look at single rounds or at the other tied
+    # teams mark the keys dirty and ensure_keys() recomputes all of them once
+    # before the ranking is read.
+
+    def _rerank(self, name):
+        d = self.teams_data.get(name)
+        if d is None:
+            self.ranking.discard(name)
+        elif self.breaker.per_team:
+            self.ranking.update(name, self.breaker.key(d['total'] - self.penalties.get(name, 0.0), d['kill']))
+        else:
+            self.keys_dirty = True
+
+    def ensure_keys(self):
+        if not self.keys_dirty: return
+        self.keys_dirty = False
+        with TIMER.stage('ranking keys'):
+            names = list(self.teams_data)
+            totals = [self.teams_data[n]['total'] - self.penalties.get(n, 0.0) for n in names]
+            kills = [self.teams_data[n]['kill'] for n in names]
+            ids = [self.scores.ids[n] for n in names]
+            rounds = [self.scores.round_scores(r, ids)[0] for r in range(self.scores.rounds)]
+            placements = None
+            if 'best_placement' in self.breaker.chain or 'wins' in self.breaker.chain:
+                placements = [[source['placements'].get(n, NAN) for n in names] for source in self.round_sources]
+            for name, key in zip(names, self.breaker.keys(totals, kills, rounds, placements)):
+                self.ranking.update(name, key)
+
+    def set_tiebreak(self, chain):
+        self.tiebreak = list(chain)
+        self.breaker = TieBreaker(self.tiebreak)
+        self.keys_dirty = True
+
+    @TIMER.timed('check_round')
+    def check_round(self, scores, is_base=False):
+        """Validates a round's teams against the base round (or makes it the base)."""
+        if is_base:
+            self.valid_teams = set(scores)
+        else:
+            for name in scores:
+                if name not in self.valid_teams:
+                    raise ValueError(f"등록되지 않은 팀 발견: {name}\n\n이 팀은 첫 번째 파일(1라운드)에 존재하지 않습니다.")
+        return scores
+
+    # Name reconciliation
+    # A team missing from the base round is usually a typo or a renamed team.
+    # Confirmed aliases are journaled and applied to every later round; a new
+    # unknown name is shown to the operator with the closest base teams.
+
+    def team_index(self):
+        if self.indexed_teams is not self.valid_teams:
+            self.name_index = NameIndex(self.valid_teams)
+            self.indexed_teams = self.valid_teams
+        return self.name_index
+
+    def reconcile(self, scores, path):
+        """Renames unknown teams through confirmed aliases, asking the operator about new ones."""
+        if not self.valid_teams:
+            return scores
+        scores = apply_aliases(scores, self.aliases, self.valid_teams)
+        if self.restoring:
+            return scores
+        for name in [n for n in scores if n not in self.valid_teams]:
+            suggestions = self.team_index().suggest(name, limit=5, exclude=scores)
+            team = self.ask_alias(name, path, suggestions) if suggestions else None
+            if team is None:
+                break  # left unknown; check_round reports it
+            self.aliases[name] = team
+            self.log({'type': 'alias', 'alias': name, 'team': team})
+            scores = apply_aliases(scores, {name: team}, self.valid_teams)
+        return scores
+
+    def ask_alias(self, name, path, suggestions):
+        win = tk.Toplevel(self.root)
+        win.title("팀 이름 확인")
+        win.geometry("420x340")
+        win.configure(bg=self.colors["bg_main"])
+        win.transient(self.root)
+        win.grab_set()
+
+        tk.Label(win, text=f"{os.path.basename(path)}\n등록되지 않은 팀: {name}\n\n같은 팀을 고르면 이후 라운드에도 적용됩니다.",
+                 bg=self.colors["bg_main"], fg=self.colors["text_main"], font=("Malgun Gothic", 10), justify=tk.CENTER).pack(pady=(20, 10))
+        lb = tk.Listbox(win, font=("Malgun Gothic", 10), activestyle="none", relief="solid", bd=1, height=5)
+        lb.pack(fill=tk.BOTH, expand=True, padx=20, pady=(0, 10))
+        for team, score in suggestions:
+            lb.insert(tk.END, f"{team}  ({score:.0%})")
+        lb.selection_set(0)
+
+        chosen = {'team': None}
+        def confirm():
+            sel = lb.curselection()
+            if not sel: return
+            chosen['team'] = suggestions[sel[0]][0]
+            win.destroy()
+
+        btns = tk.Frame(win, bg=self.colors["bg_main"])
+        btns.pack(pady=(0, 15))
+        RoundedButton(btns, "같은 팀", confirm, width=100, height=35, radius=18, bg_color=self.colors["btn_green"], hover_color=self.colors["btn_green_h"]).pack(side=tk.LEFT, padx=5)
+        RoundedButton(btns, "취소", win.destroy, width=100, height=35, radius=18, bg_color=self.colors["btn_grey"], hover_color=self.colors["btn_grey_h"]).pack(side=tk.LEFT, padx=5)
+        lb.bind("<Double-Button-1>", lambda e: confirm())
+        self.root.wait_window(win)
+        return chosen['team']
+
+    # Session journal
+    # Every state change is appended to the journal; on startup a previous
+    # session is rebuilt from the last snapshot plus the events after it.
+
+    def log(self, event):
+        if self.restoring or self.journal.file is None: return
+        try:
+            if self.journal.append(event):
+                self.journal.snapshot(self.session_state())
+        except OSError:
+            self.lbl_status.config(text="세션 기록 실패")
+
+    def session_state(self):
+        rounds = []
+        for path, delta, source in zip(self.loaded_files, self.round_deltas, self.round_sources):
+            rounds.append({'path': path, 'digest': source['digest'], 'stat': source['stat'], 'scores': delta,
+                           'placements': source['placements']})
+        return dict(self.settings_state(), rounds=rounds, penalties=self.penalties, history=self.history, aliases=self.aliases)
+
+    def settings_state(self):
+        return {name: getattr(self, name) for name in SETTINGS}
+
+    def apply_settings(self, values):
+        for name in SETTINGS:
+            if name in values:
+                setattr(self, name, values[name])
+        self.set_tiebreak(self.tiebreak)
+
+    def offer_restore(self):
+        restore = self.journal.exists() and messagebox.askyesno("세션 복구", "이전 세션 기록이 있습니다.\n복구하시겠습니까?")
+        if restore:
+            self.restore_session()
+        else:
+            self.journal.clear()
+        try:
+            self.journal.open()
+            self.journal.snapshot(self.session_state())
+        except OSError:
+            self.lbl_status.config(text="세션 기록 실패")
+
+    @TIMER.timed('restore session')
+    def restore_session(self):
+        state, events = self.journal.load()
+        self.restoring = True
+        try:
+            if state is not None:
+                self.aliases = dict(state.get('aliases', {}))
+                for entry in state['rounds']:
+                    self.add_round(entry['path'], *self._restored_round(entry))
+                self.penalties = dict(state['penalties'])
+                self.history = list(state['history'])
+                for name in self.teams_data:
+                    self._rerank(name)
+                self.apply_settings(state)
+            for event in events:
+                self._replay(event)
+        finally:
+            self.restoring = False
+        self.valid_teams = set(self.round_deltas[0]) if self.round_deltas else set()
+        self.refresh_table()
+        self.lbl_status.config(text=f"세션 복구됨: 파일 {len(self.loaded_files)}개")
+
+    def _replay(self, event):
+        kind = event['type']
+        try:
+            if kind == 'add':
+                self.add_round(event['path'], *self._restored_round(event))
+            elif kind == 'remove':
+                self.remove_round(event['index'])
+            elif kind == 'move':
+                self.move_round(event['src'], event['dst'])
+            elif kind == 'penalty':
+                self.penalize(event['team'], event['amount'], event['reset'])
+            elif kind == 'undo_penalty' and self.history:
+                last = self.history.pop()
+                self.penalties[last['team']] -= last['amount']
+                self._rerank(last['team'])
+            elif kind == 'settings':
+                self.apply_settings(event)
+            elif kind == 'alias':
+                self.aliases[event['alias']] = event['team']
+        except (ValueError, IndexError):
+            pass
 
+    def _restored_round(self, entry):
+        """Uses the journaled scores unless the file on disk now has different content."""
+        scores = {name: tuple(v) for name, v in entry['scores'].items()}
+        source = {'digest': entry['digest'], 'stat': entry['stat'], 'placements': dict(entry.get('placements', {}))}
+        try:
+            st = os.stat(entry['path'])
+        except OSError:
+            return scores, source  # file moved or deleted: the journal copy is all we have
+        # Journals from before placements were kept need the file read once for them
+        if entry['stat'] is not None and [st.st_size, st.st_mtime] == list(entry['stat']) and 'placements' in entry:
+            return scores, source
+        try:
+            record = self.cache.read_round(entry['path'])
+        except (OSError, RoundFileError):
+            return scores, source
+        if record.digest == entry['digest']:
+            return scores, self.round_source(record, scores)
+        scores = apply_aliases(record.scores, self.aliases)
+        return scores, self.round_source(record, scores)
+
+    # Watch mode
+    # The watcher thread only reads files; rounds are validated and applied here
+    # on the Tk thread by draining self.events from an after() loop.
+
+    def toggle_watch(self):
+        if self.watcher is not None:
+            self.watcher.stop()
+            self.watcher = None
+            self.lbl_status.config(text="자동 감지 중지됨")
+            return
+        folder = filedialog.askdirectory(title="결과 폴더 선택")
+        if not folder: return
+        self.watcher = ResultsWatcher(folder,
+                                      lambda record: self.events.put(('round', record)),
+                                      lambda path, e: self.events.put(('error', path)),
+                                      reader=self.cache.read_round)
+        self.watcher.start()
+        self.lbl_status.config(text=f"자동 감지 중: {folder}")
+
+    def poll_events(self):
+        try:
+            while True:
+                try:
+                    kind, payload = self.events.get_nowait()
+                except queue.Empty:
+                    break
+                try:
+                    self.dispatch_event(kind, payload)
+                except Exception as e:
+                    # A failing handler must not stop the pump or leave a load hanging
+                    if kind == 'loaded' and self.loading is not None:
+                        self.finish_loading("불러오기 실패")
+                    else:
+                        self.lbl_status.config(text="처리 실패")
+                    messagebox.showerror("오류", f"처리 중 오류가 발생했습니다.\n\n{e}")
+            if TIMER.enabled and TIMER.last is not self.shown_timing:
+                self.shown_timing = TIMER.last
+                name, seconds = TIMER.last
+                self.lbl_timing.config(text=f"마지막 작업: {name} {seconds * 1000:.1f} ms")
+        finally:
+            self.root.after(100, self.poll_events)
+
+    def dispatch_event(self, kind, payload):
+        if kind == 'loaded':
+            self.on_file_loaded(*payload)
+        elif kind == 'round':
+            self.ingest_record(payload)
+        elif kind == 'simulated':
+            self.show_simulation(*payload)
+        elif kind == 'error':
+            self.lbl_status.config(text=f"읽기 실패: {os.path.basename(payload)}")
+
+    def is_duplicate(self, record):
+        """True if a round with the same file content is already loaded, whatever its path."""
+        return any(source['digest'] == record.digest for source in self.round_sources)
+
+    @TIMER.timed('ingest watched round')
+    def ingest_record(self, record):
+        path = os.path.abspath(record.path)
+        if path in self.loaded_files: return
+        if self.is_duplicate(record):
+            self.lbl_status.config(text=f"중복 파일 제외: {os.path.basename(path)}")
+            return
+        try:
+            delta = self.check_round(self.reconcile(record.scores, path), is_base=(len(self.valid_teams)==0))
+        except ValueError as e:
+            self.lbl_status.config(text=f"추가 실패: {os.path.basename(path)}")
+            messagebox.showerror("오류", f"{os.path.basename(path)}\n\n{e}")
+            return
+        self.add_round(path, delta, self.round_source(record, delta))
+        self.refresh_table()
+        self.lbl_status.config(text=f"자동 추가됨: {os.path.basename(path)}")
+
+    @TIMER.timed('refresh_table')
     def refresh_table(self):
-        for item in self.tree.get_children(): self.tree.delete(item)
-        ranks = []
-        for team, d in self.teams_data.items():
+        self.ensure_keys()
+        cols = self.tree["columns"]
+        self.tree.configure(displaycolumns=cols if self.checkpoint_mode else cols[:5])
+        with TIMER.stage('checkpoint analysis'):
+            self.checkpoint_info = self.analyze_checkpoint() if self.checkpoint_mode else {}
+        with TIMER.stage('treeview update'):
+            self.table.update(RankedRows(self.ranking, self.make_row, self.shared_ranks))
+        if self.server is not None:
+            with TIMER.stage('publish standings'):
+                self.server.publish(self.standings())
+
+    # Timing
+    # Stages are timed by stage_timer.TIMER; poll_events shows the latency of
+    # the last whole operation while measuring is on.
+
+    def toggle_timing(self):
+        if TIMER.enabled:
+            TIMER.disable()
+            self.btn_timing.config(text="성능 측정")
+            self.btn_dump.pack_forget()
+            self.lbl_timing.pack_forget()
+            return
+        TIMER.reset()
+        TIMER.enable()
+        self.shown_timing = None
+        self.btn_timing.config(text="측정 끄기")
+        self.btn_dump.pack(side=tk.RIGHT, padx=(10, 0), before=self.btn_timing)
+        self.lbl_timing.config(text="측정 중...")
+        self.lbl_timing.pack(side=tk.RIGHT, padx=(10, 0), before=self.btn_dump)
+
+    def dump_timing(self):
+        path = filedialog.asksaveasfilename(title="통계 저장", defaultextension=".json", filetypes=[("JSON files", "*.json")])
+        if not path: return
+        try:
+            TIMER.dump(path)
+        except OSError as e:
+            messagebox.showerror("오류", f"저장할 수 없습니다.\n\n{e}")
+            return
+        self.lbl_status.config(text=f"통계 저장됨: {os.path.basename(path)}")
+
+    # Broadcast server
+    # The server runs its own event loop thread; the Tk thread only hands it a
+    # plain list after each refresh, so overlay clients never touch Tk state.
+
+    def toggle_server(self):
+        if self.server is not None:
+            self.server.stop()
+            self.server = None
+            self.lbl_status.config(text="방송 서버 중지됨")
+            return
+        server = ScoreboardServer()
+        try:
+            server.start()
+        except OSError as e:
+            messagebox.showerror("오류", f"방송 서버를 시작할 수 없습니다.\n\n{e}")
+            return
+        self.server = server
+        self.server.publish(self.standings())
+        self.lbl_status.config(text=f"방송 서버 실행 중: http://{server.host}:{server.port}/")
+
+    def standings(self):
+        self.ensure_keys()
+        teams = list(self.ranking)
+        ranks = range(1, len(teams) + 1)
+        if self.shared_ranks:
+            ranks = competition_ranks([self.ranking.key(team) for team in teams])
+        rows = []
+        for rank, team in zip(ranks, teams):
+            d = self.teams_data[team]
             p = self.penalties.get(team, 0.0)
-            final_total = d['total'] - p
-            ranks.append({'team':team, 'total':final_total, 'kill':d['kill'], 'penalty':p})
-        ranks.sort(key=lambda x: (x['total'], x['kill']), reverse=True)
-        
-        for i, item in enumerate(ranks):
-            tag = ()
-            if self.checkpoint_mode and item['total'] >= self.checkpoint_score:
-                tag = ("checkpoint",)
-            
-            self.tree.insert("", "end", values=(
-                i+1, 
-                item['team'], 
-                f"{item['total']:.1f}", 
-                f"{item['kill']:.1f}", 
-                f"-{item['penalty']:.1f}" if item['penalty']>0 else "0"
-            ), tags=tag)
+            total = d['total'] - p
+            rows.append({'rank': rank, 'team': team, 'total': total, 'kill': d['kill'], 'penalty': p,
+                         'checkpoint': self.checkpoint_mode and total >= self.checkpoint_score})
+        return rows
 
-    def on_tree_select(self, event):
+    def analyze_checkpoint(self):
+        """Clinch / elimination status of every team for the checkpoint columns."""
+        teams = list(self.teams_data)
+        crossed, crossed_totals = self.checkpoint_crossings(teams)
+        rows = []
+        for j, name in enumerate(teams):
+            d = self.teams_data[name]
+            row = {'team': name, 'total': d['total'] - self.penalties.get(name, 0.0), 'kill': d['kill'], 'crossed': crossed[j]}
+            if crossed[j] is not None:
+                row['crossed_total'] = crossed_totals[j]
+            rows.append(row)
+        return checkpoint.analyze(rows, self.checkpoint_score, self.remaining_rounds,
+                                  self.round_max_score, self.checkpoint_slots)
+
+    def checkpoint_crossings(self, teams):
+        """Round each team reached the checkpoint score (None if not yet) and its running total then."""
+        if not self.scores.rounds:
+            return [None] * len(teams), [None] * len(teams)
+        cumulative = self.scores.cumulative([self.scores.ids[name] for name in teams])[0]
+        crossed = checkpoint.crossing_rounds(cumulative, self.checkpoint_score)
+        return crossed, [None if r is None else float(cumulative[r][j]) for j, r in enumerate(crossed)]
+
+    def make_row(self, rank, team):
+        d = self.teams_data[team]
+        p = self.penalties.get(team, 0.0)
+        total = d['total'] - p
+        tag = ()
+        if self.checkpoint_mode and total >= self.checkpoint_score:
+            tag = ("checkpoint",)
+        info = self.checkpoint_info.get(team)
+        cp = ("", "", "")
+        if info is not None:
+            cp = (CHECKPOINT_STATUS[info['status']],
+                  f"{info['need']:.1f}" if info['status'] == checkpoint.ALIVE else "-",
+                  f"{info['secure']:.1f}" if info['status'] == checkpoint.ALIVE and info['secure'] is not None else "-")
+        return (team, (
+            rank, 
+            team, 
+            f"{total:.1f}", 
+            f"{d['kill']:.1f}", 
+            f"-{p:.1f}" if p>0 else "0"
+        ) + cp, tag)
+
+    def selected_team(self):
         sel = self.tree.selection()
-        if sel: 
-            name = self.tree.item(sel[0])['values'][1]
+        return self.table.team_of(sel[0]) if sel else None
+
+    def on_tree_select(self, event):
+        name = self.selected_team()
+        if name is not None:
             self.lbl_selected.config(text=f"선택된 팀: {name}")
 
+    @TIMER.timed('apply penalty')
     def apply_penalty(self, amt, reset=False):
-        sel = self.tree.selection()
-        if not sel: 
+        name = self.selected_team()
+        if name is None: 
             messagebox.showwarning("주의", "팀을 먼저 선택해주세요.")
             return
             
-        name = self.tree.item(sel[0])['values'][1]
+        self.penalize(name, amt, reset)
+        self.refresh_table()
+
+    def penalize(self, name, amt, reset=False):
         if reset: 
             self.penalties[name] = 0.0
             self.history = [h for h in self.history if h['team'] != name]
         else:
             self.penalties[name] = self.penalties.get(name, 0.0) + amt
             self.history.append({'team':name, 'amount':amt})
-        self.refresh_table()
+        self._rerank(name)
+        self.log({'type': 'penalty', 'team': name, 'amount': amt, 'reset': reset})
 
+    @TIMER.timed('undo penalty')
     def undo_penalty(self):
         if self.history:
             last = self.history.pop()
             self.penalties[last['team']] -= last['amount']
+            self._rerank(last['team'])
+            self.log({'type': 'undo_penalty'})
             self.refresh_table()
         else:
             messagebox.showinfo("알림", "취소할 작업이 없습니다.")
@@ -284,7 +1013,7 @@ class TournamentApp:
     def open_settings(self):
         win = tk.Toplevel(self.root)
         win.title("설정")
-        win.geometry("320x240")
+        win.geometry("320x560")
         win.configure(bg=self.colors["bg_main"])
         win.transient(self.root)  # Set as transient window
         win.grab_set()           # Make it modal
@@ -297,7 +1026,7 @@ class TournamentApp:
         main_h = self.root.winfo_height()
         
         x = main_x + (main_w // 2) - 160
-        y = main_y + (main_h // 2) - 120
+        y = main_y + (main_h // 2) - 280
         win.geometry(f"+{x}+{y}")
         
         # Header
@@ -315,17 +1044,44 @@ class TournamentApp:
         f = tk.Frame(win, bg=self.colors["bg_main"])
         f.pack(pady=15)
         
-        tk.Label(f, text="기준 점수:", bg=self.colors["bg_main"], 
-                 font=("Malgun Gothic", 10, "bold"), fg=self.colors["text_main"]).pack(side=tk.LEFT)
-                 
-        ent = tk.Entry(f, width=10, font=("Malgun Gothic", 10), justify="center", relief="solid", bd=1)
-        ent.insert(0, str(self.checkpoint_score))
-        ent.pack(side=tk.LEFT, padx=10)
+        entries = {}
+        fields = (("checkpoint_score", "기준 점수:", float), ("remaining_rounds", "남은 라운드:", int),
+                  ("round_max_score", "라운드 최대 점수:", float), ("checkpoint_slots", "통과 팀 수:", int))
+        for row, (name, label, _) in enumerate(fields):
+            tk.Label(f, text=label, bg=self.colors["bg_main"], 
+                     font=("Malgun Gothic", 10, "bold"), fg=self.colors["text_main"]).grid(row=row, column=0, sticky="e", pady=4)
+                     
+            ent = tk.Entry(f, width=10, font=("Malgun Gothic", 10), justify="center", relief="solid", bd=1)
+            ent.insert(0, str(getattr(self, name)))
+            ent.grid(row=row, column=1, padx=10, pady=4)
+            entries[name] = ent
+
+        # Tiebreak
+        tk.Label(win, text="순위 결정 방식", font=("Malgun Gothic", 14, "bold"),
+                 bg=self.colors["bg_main"], fg=self.colors["text_main"]).pack(pady=(5, 5))
+        ent_chain = tk.Entry(win, width=30, font=("Malgun Gothic", 10), justify="center", relief="solid", bd=1)
+        ent_chain.insert(0, ", ".join(self.tiebreak))
+        ent_chain.pack(pady=4)
+        tk.Label(win, text="\n".join((", ".join(CRITERIA[:4]), ", ".join(CRITERIA[4:]))), bg=self.colors["bg_main"],
+                 fg="#656D78", font=("Malgun Gothic", 8)).pack()
+        shared = tk.BooleanVar(value=self.shared_ranks)
+        tk.Checkbutton(win, text="동점 팀 공동 순위 (1, 2, 2, 4)", variable=shared,
+                       bg=self.colors["bg_main"], activebackground=self.colors["bg_main"],
+                       selectcolor="white", font=("Malgun Gothic", 10)).pack(pady=(5, 15))
         
         def save():
+            try:
+                chain = parse_chain(ent_chain.get())
+            except ValueError as e:
+                messagebox.showerror("오류", str(e), parent=win)
+                return
             self.checkpoint_mode = var.get()
-            try: self.checkpoint_score = float(ent.get())
-            except: pass
+            for name, _, cast in fields:
+                try: setattr(self, name, max(0, cast(entries[name].get())))
+                except: pass
+            self.shared_ranks = shared.get()
+            self.set_tiebreak(chain)
+            self.log(dict(self.settings_state(), type='settings'))
             self.refresh_table()
             win.destroy()
         
@@ -334,6 +1090,190 @@ class TournamentApp:
                                  bg_color=self.colors["btn_blue"], hover_color=self.colors["btn_blue_h"])
         btn_save.pack(pady=(0, 20))
 
+    def open_rounds(self):
+        win = tk.Toplevel(self.root)
+        win.title("라운드 관리")
+        win.geometry("420x360")
+        win.configure(bg=self.colors["bg_main"])
+        win.transient(self.root)
+        win.grab_set()
+
+        lb = tk.Listbox(win, font=("Malgun Gothic", 10), activestyle="none", relief="solid", bd=1)
+        lb.pack(fill=tk.BOTH, expand=True, padx=20, pady=(20, 10))
+
+        def fill(select=None):
+            lb.delete(0, tk.END)
+            for i, f in enumerate(self.loaded_files):
+                lb.insert(tk.END, f"{i+1}라운드  {os.path.basename(f)}")
+            if select is not None and self.loaded_files:
+                lb.selection_set(max(0, min(select, len(self.loaded_files) - 1)))
+
+        def run(action):
+            sel = lb.curselection()
+            if not sel: return
+            i = sel[0]
+            try:
+                target = action(i)
+            except Exception as e:
+                messagebox.showerror("오류", str(e), parent=win)
+                return
+            self.refresh_table()
+            fill(target)
+
+        def remove(i):
+            removed = self.remove_round(i)
+            self.lbl_status.config(text=f"취소됨: {os.path.basename(removed)}")
+            return i
+
+        def move(step):
+            def _move(i):
+                j = max(0, min(i + step, len(self.loaded_files) - 1))
+                self.move_round(i, j)
+                return j
+            return _move
+
+        btns = tk.Frame(win, bg=self.colors["bg_main"])
+        btns.pack(pady=(0, 15))
+        for text, cmd, bg, hover in (("위로", lambda: run(move(-1)), self.colors["btn_grey"], self.colors["btn_grey_h"]),
+                                     ("아래로", lambda: run(move(1)), self.colors["btn_grey"], self.colors["btn_grey_h"]),
+                                     ("삭제", lambda: run(remove), self.colors["btn_red"], self.colors["btn_red_h"])):
+            RoundedButton(btns, text, cmd, width=90, height=35, radius=18, bg_color=bg, hover_color=hover).pack(side=tk.LEFT, padx=5)
+        fill()
+
+    def open_history(self):
+        if not self.round_deltas:
+            messagebox.showinfo("알림", "추가된 파일이 없습니다.")
+            return
+        win = tk.Toplevel(self.root)
+        win.title("순위 변동")
+        win.geometry("900x600")
+        win.configure(bg=self.colors["bg_main"])
+        win.transient(self.root)
+
+        teams = list(self.teams_data)
+        ids = [self.scores.ids[name] for name in teams]
+        history = self.scores.rank_history(ids, [self.penalties.get(name, 0.0) for name in teams])
+        movement = self.scores.movement(ids, [self.penalties.get(name, 0.0) for name in teams])
+        rounds = self.scores.rounds
+
+        cols = ["team"] + [f"r{r}" for r in range(rounds)] + ["move"]
+        frame = tk.Frame(win, bg="white", padx=10, pady=10)
+        frame.pack(fill=tk.BOTH, expand=True, padx=20, pady=20)
+        tree = ttk.Treeview(frame, columns=cols, show="headings")
+        tree.heading("team", text="팀 이름")
+        tree.column("team", width=220, anchor="w")
+        for r in range(rounds):
+            tree.heading(f"r{r}", text=f"{r+1}R")
+            tree.column(f"r{r}", width=50, anchor="center")
+        tree.heading("move", text="변동")
+        tree.column("move", width=60, anchor="center")
+
+        xscroll = ttk.Scrollbar(frame, orient=tk.HORIZONTAL, command=tree.xview)
+        yscroll = ttk.Scrollbar(frame, orient=tk.VERTICAL, command=tree.yview)
+        tree.configure(xscroll=xscroll.set, yscroll=yscroll.set)
+        xscroll.pack(side=tk.BOTTOM, fill=tk.X)
+        yscroll.pack(side=tk.RIGHT, fill=tk.Y)
+        tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+
+        final = history[-1]
+        for j in sorted(range(len(teams)), key=lambda j: final[j]):
+            m = movement[j]
+            tree.insert("", "end", values=[teams[j]] + [int(history[r][j]) for r in range(rounds)]
+                        + [f"▲{m}" if m > 0 else f"▼{-m}" if m < 0 else "-"])
+
+    # Simulation
+    # The Tk thread snapshots the standings, simulation.simulate runs on the
+    # worker pool and poll_events hands the result back to the open window.
+
+    def open_simulation(self):
+        if not self.round_deltas:
+            messagebox.showinfo("알림", "추가된 파일이 없습니다.")
+            return
+        win = tk.Toplevel(self.root)
+        win.title("확률 예측")
+        win.geometry("760x600")
+        win.configure(bg=self.colors["bg_main"])
+        win.transient(self.root)
+
+        controls = tk.Frame(win, bg=self.colors["bg_main"])
+        controls.pack(fill=tk.X, padx=20, pady=(20, 0))
+        sims_var = tk.StringVar(value=str(default_sims(len(self.teams_data), self.remaining_rounds)))
+        top_var = tk.StringVar(value="3")
+        for text, var, width in (("시뮬레이션 횟수:", sims_var, 10), ("상위 N:", top_var, 4)):
+            tk.Label(controls, text=text, bg=self.colors["bg_main"], font=("Malgun Gothic", 10)).pack(side=tk.LEFT)
+            tk.Entry(controls, textvariable=var, width=width, font=("Malgun Gothic", 10)).pack(side=tk.LEFT, padx=(5, 15))
+        tk.Label(controls, text=f"남은 라운드: {self.remaining_rounds}", bg=self.colors["bg_main"], fg="#656D78",
+                 font=("Malgun Gothic", 10)).pack(side=tk.LEFT)
+
+        cols = ("team", "total", "expected", "first", "top", "pass")
+        frame = tk.Frame(win, bg="white", padx=10, pady=10)
+        frame.pack(fill=tk.BOTH, expand=True, padx=20, pady=(10, 0))
+        tree = ttk.Treeview(frame, columns=cols, show="headings",
+                            displaycolumns=cols if self.checkpoint_mode else cols[:-1])
+        headers = {"team": "팀 이름", "total": "종합 점수", "expected": "평균 순위", "first": "1위 확률",
+                   "top": "상위 N 확률", "pass": "체크포인트 통과"}
+        for col, text in headers.items():
+            tree.heading(col, text=text)
+            tree.column(col, width=220 if col == "team" else 100, anchor="w" if col == "team" else "center")
+        yscroll = ttk.Scrollbar(frame, orient=tk.VERTICAL, command=tree.yview)
+        tree.configure(yscroll=yscroll.set)
+        yscroll.pack(side=tk.RIGHT, fill=tk.Y)
+        tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+
+        lbl = tk.Label(win, text="", bg=self.colors["bg_main"], fg="#656D78", font=("Malgun Gothic", 9))
+        lbl.pack(pady=(5, 0))
+        view = {'win': win, 'tree': tree, 'label': lbl}
+
+        def run():
+            try:
+                sims, top = int(sims_var.get()), int(top_var.get())
+                if sims <= 0 or top <= 0:
+                    raise ValueError
+            except ValueError:
+                messagebox.showerror("오류", "1 이상의 정수를 입력하세요.", parent=win)
+                return
+            tree.heading("top", text=f"상위 {top} 확률")
+            lbl.config(text="계산 중...")
+            self.run_simulation(view, sims, top)
+
+        RoundedButton(win, "실행", run, width=100, height=35, radius=18, bg_color=self.colors["btn_blue"],
+                      hover_color=self.colors["btn_blue_h"]).pack(pady=15)
+        run()
+
+    def run_simulation(self, view, sims, top):
+        self.ensure_keys()
+        teams = list(self.ranking)
+        ids = [self.scores.ids[name] for name in teams]
+        totals = [self.teams_data[name]['total'] - self.penalties.get(name, 0.0) for name in teams]
+        kills = [self.teams_data[name]['kill'] for name in teams]
+        round_totals = [[column[i] for i in ids] for column in self.scores.totals]
+        round_kills = [[column[i] for i in ids] for column in self.scores.kills]
+        cp = None
+        if self.checkpoint_mode:
+            crossed, crossed_totals = self.checkpoint_crossings(teams)
+            cp = {'score': self.checkpoint_score, 'slots': self.checkpoint_slots,
+                  'crossed': crossed, 'crossed_total': crossed_totals}
+        future = self.pool.submit(simulate, totals, kills, round_totals, round_kills,
+                                  self.remaining_rounds, sims, top, cp)
+        future.add_done_callback(lambda f: self.events.put(('simulated', (view, teams, totals, f))))
+
+    def show_simulation(self, view, teams, totals, future):
+        if not view['win'].winfo_exists(): return
+        try:
+            result = future.result()
+        except RuntimeError as e:
+            view['label'].config(text="")
+            messagebox.showerror("오류", str(e), parent=view['win'])
+            return
+        tree = view['tree']
+        tree.delete(*tree.get_children())
+        passed = result['checkpoint']
+        for j, team in enumerate(teams):
+            tree.insert("", "end", values=(team, f"{totals[j]:.1f}", f"{result['expected'][j]:.2f}",
+                                           f"{result['first'][j]:.1%}", f"{result['top'][j]:.1%}",
+                                           f"{passed[j]:.1%}" if passed is not None else ""))
+        view['label'].config(text=f"{result['sims']:,}회 시뮬레이션 완료")
+
 if __name__ == "__main__":
     root = tk.Tk()
     app = TournamentApp(root)